@@ -7,6 +7,7 @@ def register_nodes_metadata():
         "nodes": [
             "chimerapy.pipelines.generic_nodes.video_nodes:Video",
             "chimerapy.pipelines.generic_nodes.video_nodes:ShowWindows",
+            "chimerapy.pipelines.generic_nodes.mjpeg_server:MJPEGServer",
             "chimerapy.pipelines.generic_nodes.log_reader:LogReader",
             "chimerapy.pipelines.generic_nodes.screen_capture:ScreenCapture",
             "chimerapy.pipelines.generic_nodes.audio_node:AudioNode",
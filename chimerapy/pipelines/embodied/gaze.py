@@ -1,4 +1,3 @@
-import tempfile
 import typing
 from typing import Dict, Literal, Optional
 
@@ -10,7 +9,7 @@ import numpy as np
 
 import chimerapy.engine as cpe
 from chimerapy.orchestrator import step_node
-from chimerapy.pipelines.utils import download_file
+from chimerapy.pipelines.utils import cached_download
 
 
 @step_node(name="CPPipelines_GazeL2CSNet")
@@ -20,7 +19,10 @@ class GazeL2CSNet(cpe.Node):
     Parameters
     ----------
     weights: str, required
-        Path or url to the weights file
+        Path or url to the weights file. Downloaded weights are kept in the
+        package cache
+    weights_sha256: str, optional (default: None)
+        The expected sha256 of downloaded weights
     imgsz: int, optional (default: 640)
         The size of the image to be used for detection
     device: Literal["cpu", "cuda"], optional (default: "cpu")
@@ -43,10 +45,12 @@ class GazeL2CSNet(cpe.Node):
         name: str = "GazeL2CSNet",
         frames_key: str = "frame",
         show: bool = False,
+        weights_sha256: Optional[str] = None,
         **kwargs,
     ) -> None:
 
         self.weights = weights
+        self.weights_sha256 = weights_sha256
         self.model_params = {
             "arch": arch,
             "weights": weights,
@@ -70,13 +74,10 @@ class GazeL2CSNet(cpe.Node):
         self.model_params["device"] = torch.device(dev)
 
         if self.model_params["weights"].startswith("http"):
-            with tempfile.NamedTemporaryFile(suffix=".pkl") as f:
-                self.model_params["weights"] = self.download_weights(
-                    self.model_params["weights"], f.name
-                )
-                self.model = Pipeline(**self.model_params)
-        else:
-            self.model = Pipeline(**self.model_params)
+            self.model_params["weights"] = self.download_weights(
+                self.model_params["weights"], self.weights_sha256
+            )
+        self.model = Pipeline(**self.model_params)
         self.render = render
 
     def step(self, data_chunks: Dict[str, cpe.DataChunk]) -> cpe.DataChunk:
@@ -102,7 +103,7 @@ class GazeL2CSNet(cpe.Node):
         return ret_chunk
 
     @staticmethod
-    def download_weights(url: str, fname: str, chunk_size=1024) -> str:
-        return download_file(
-            url, fname, chunk_size=chunk_size, desc="Downloading weights"
+    def download_weights(url: str, sha256: Optional[str] = None) -> str:
+        return str(
+            cached_download(url, sha256=sha256, desc="Downloading weights")
         )
@@ -0,0 +1,86 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+class FrameBufferPool:
+    """A ring of preallocated, fixed-shape frame buffers.
+
+    Buffers are handed out round-robin, so a buffer is reused after ``size``
+    further calls to ``acquire``. The pool only allocates when it is first
+    used or when the requested shape changes, which makes ``allocations`` a
+    direct measure of steady-state allocation churn.
+
+    Parameters
+    ----------
+    size : int, optional (default: 4)
+        The number of buffers in the ring. This must be larger than the number
+        of buffers that may still be in use (e.g. queued or in flight to
+        downstream nodes) when a buffer comes up for reuse
+    dtype : np.dtype, optional (default: np.uint8)
+        The dtype of the buffers
+    """
+
+    def __init__(self, size: int = 4, dtype: np.dtype = np.uint8) -> None:
+        if size < 1:
+            raise ValueError(f"Buffer pool size must be positive, got {size}")
+
+        self.size = size
+        self.dtype = np.dtype(dtype)
+        self.shape: Optional[Tuple[int, ...]] = None
+        self.allocations = 0
+        self.acquired = 0
+
+        self._buffers: List[np.ndarray] = []
+        self._index = 0
+
+    def acquire(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """Return the next buffer of the given shape."""
+        shape = tuple(shape)
+        if shape != self.shape:
+            self._allocate(shape)
+
+        buffer = self._buffers[self._index]
+        self._index = (self._index + 1) % self.size
+        self.acquired += 1
+
+        return buffer
+
+    def owns(self, arr: np.ndarray) -> bool:
+        """Whether the array is one of the pool's buffers."""
+        return any(arr is buffer for buffer in self._buffers)
+
+    def _allocate(self, shape: Tuple[int, ...]) -> None:
+        self._buffers = [
+            np.empty(shape, dtype=self.dtype) for _ in range(self.size)
+        ]
+        self.allocations += self.size
+        self.shape = shape
+        self._index = 0
+
+    def stats(self) -> dict:
+        return {
+            "shape": self.shape,
+            "size": self.size,
+            "allocations": self.allocations,
+            "acquired": self.acquired,
+        }
+
+
+def resize_dims(
+    shape: Tuple[int, ...], width: Optional[int], height: Optional[int]
+) -> Tuple[int, int]:
+    """The (width, height) an image is resized to by ``imutils.resize``.
+
+    The aspect ratio is preserved; ``width`` takes precedence over ``height``.
+    """
+    h, w = shape[:2]
+    if width is None and height is None:
+        return w, h
+
+    if width is None:
+        r = height / float(h)
+        return int(w * r), height
+
+    r = width / float(w)
+    return width, int(h * r)
@@ -0,0 +1,180 @@
+import json
+import os
+import pathlib
+import uuid
+from typing import BinaryIO, Optional, Tuple, Union
+
+import numpy as np
+
+from chimerapy.pipelines.utils import file_sha256, get_cache_dir
+
+
+class DecodedFrameCache:
+    """An on-disk cache of the decoded (and resized) frames of a video.
+
+    The frames of a complete pass are stored as one raw array, which later
+    passes (and later runs) read back through a read-only ``np.memmap``
+    instead of decoding the video again.
+
+    Parameters
+    ----------
+    key : str
+        The cache key, see ``for_source``
+    directory : pathlib.Path, optional
+        The cache directory, defaults to the ``frames`` package cache
+
+    Notes
+    -----
+        The frames are written to a private temporary file during the first
+        pass and atomically renamed once the pass is complete, so several
+        nodes can decode the same source concurrently and an interrupted pass
+        never leaves a partial cache entry behind.
+    """
+
+    def __init__(
+        self, key: str, directory: Optional[pathlib.Path] = None
+    ) -> None:
+        self.key = key
+        self.directory = pathlib.Path(directory or get_cache_dir("frames"))
+        self.data_path = self.directory / f"{key}.frames"
+        self.meta_path = self.directory / f"{key}.json"
+
+        self.shape: Optional[Tuple[int, ...]] = None
+        self.dtype: Optional[np.dtype] = None
+        self.count = 0
+        self._part_path: Optional[pathlib.Path] = None
+        self._part_file: Optional[BinaryIO] = None
+
+    @classmethod
+    def for_source(
+        cls,
+        video_src: str,
+        width: Optional[int],
+        height: Optional[int],
+        codec: str,
+        directory: Optional[pathlib.Path] = None,
+        frame_range: Optional[Tuple[int, Optional[int]]] = None,
+        stride: int = 1,
+    ) -> "DecodedFrameCache":
+        """The cache of a local file, keyed by its content.
+
+        Remote sources must be downloaded first, so that a changed remote
+        video is never replayed from stale frames. ``frame_range`` is the
+        (start, end) range of frames played, if the whole video is not
+        played, and ``stride`` the decimation applied.
+        """
+        if video_src.startswith("http"):
+            raise ValueError(
+                f"Cannot cache the frames of {video_src}, download it first"
+            )
+
+        directory = pathlib.Path(directory or get_cache_dir("frames"))
+        source_hash = _content_hash(video_src, directory)
+
+        codec = "".join(c if c.isalnum() else "_" for c in codec) or "none"
+        key = f"{source_hash[:32]}_{width}x{height}_{codec}"
+        if frame_range is not None:
+            key += f"_{frame_range[0]}-{frame_range[1]}"
+        if stride > 1:
+            key += f"_s{stride}"
+        return cls(key, directory)
+
+    def load(self) -> Optional[np.memmap]:
+        """Map the cached frames, if a complete pass is cached."""
+        if not self.meta_path.exists() or not self.data_path.exists():
+            return None
+
+        with open(self.meta_path) as f:
+            meta = json.load(f)
+
+        if meta["count"] == 0:
+            return None
+
+        return np.memmap(
+            self.data_path,
+            dtype=np.dtype(meta["dtype"]),
+            mode="r",
+            shape=(meta["count"], *meta["shape"]),
+        )
+
+    def append(self, frame: np.ndarray) -> bool:
+        """Add the next decoded frame of the pass being recorded.
+
+        Returns False (and stops recording) if the frame shape changes.
+        """
+        if self.shape is None:
+            self.shape = frame.shape
+            self.dtype = frame.dtype
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._part_path = self.directory / (
+                f"{self.key}.frames.{os.getpid()}-{uuid.uuid4().hex[:8]}.part"
+            )
+            self._part_file = open(self._part_path, "wb")
+
+        if self._part_file is None:
+            return False
+
+        if frame.shape != self.shape or frame.dtype != self.dtype:
+            self.abort()
+            return False
+
+        self._part_file.write(np.ascontiguousarray(frame).tobytes())
+        self.count += 1
+        return True
+
+    def finish(self) -> Optional[np.memmap]:
+        """Commit the recorded pass and map it."""
+        if self._part_file is None:
+            return None
+
+        self._part_file.close()
+        self._part_file = None
+        os.replace(self._part_path, self.data_path)
+
+        meta = {
+            "count": self.count,
+            "shape": list(self.shape),
+            "dtype": self.dtype.str,
+        }
+        tmp_meta = self._part_path.with_suffix(".json")
+        with open(tmp_meta, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, self.meta_path)
+
+        return self.load()
+
+    def abort(self) -> None:
+        """Discard the pass being recorded."""
+        if self._part_file is not None:
+            self._part_file.close()
+            self._part_file = None
+
+        if self._part_path is not None and self._part_path.exists():
+            self._part_path.unlink()
+
+
+def _content_hash(
+    fname: Union[str, pathlib.Path], directory: pathlib.Path
+) -> str:
+    """The sha256 of a file, memoized by path, size and modification time."""
+    stat = os.stat(fname)
+    memo_key = f"{os.path.abspath(fname)}:{stat.st_size}:{stat.st_mtime_ns}"
+    memo_path = directory / "content_hashes.json"
+
+    memo = {}
+    if memo_path.exists():
+        try:
+            with open(memo_path) as f:
+                memo = json.load(f)
+        except json.JSONDecodeError:
+            memo = {}
+
+    if memo_key not in memo:
+        memo[memo_key] = file_sha256(fname)
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = memo_path.with_suffix(f".{uuid.uuid4().hex[:8]}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(memo, f)
+        os.replace(tmp_path, memo_path)
+
+    return memo[memo_key]
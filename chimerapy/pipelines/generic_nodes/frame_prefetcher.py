@@ -0,0 +1,128 @@
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Literal, Optional
+
+
+class FramePrefetcher:
+    """A background thread that fills a bounded ring with pre-read frames.
+
+    The ``read_fn`` callable is invoked repeatedly on a dedicated thread and
+    its return values are buffered until they are popped with ``get``. When
+    ``read_fn`` returns ``None`` the source is considered exhausted and the
+    thread exits once the ring has been drained.
+
+    Parameters
+    ----------
+    read_fn : Callable[[], Any]
+        The function producing the next item, or ``None`` at the end of stream
+    depth : int, optional (default: 8)
+        The maximum number of items held in the ring
+    policy : Literal["block", "drop_oldest"], optional (default: "block")
+        What the decoder thread does when the ring is full. ``block`` waits
+        for the consumer, ``drop_oldest`` discards the oldest buffered item
+    name : str, optional (default: "FramePrefetcher")
+        The name of the decoder thread
+    """
+
+    def __init__(
+        self,
+        read_fn: Callable[[], Any],
+        depth: int = 8,
+        policy: Literal["block", "drop_oldest"] = "block",
+        name: str = "FramePrefetcher",
+    ) -> None:
+        if depth < 1:
+            raise ValueError(f"Prefetch depth must be positive, got {depth}")
+
+        if policy not in ("block", "drop_oldest"):
+            raise ValueError(f"Invalid prefetch policy: {policy}")
+
+        self.read_fn = read_fn
+        self.depth = depth
+        self.policy = policy
+        self.name = name
+
+        self.dropped = 0
+        self.exhausted = False
+        self.error: Optional[BaseException] = None
+
+        self._ring: Deque[Any] = deque()
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._ring)
+
+    def start(self) -> None:
+        """Start the decoder thread."""
+        if self._thread is not None:
+            return
+
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name=self.name, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 2.0) -> None:
+        """Stop the decoder thread and discard any buffered items."""
+        with self._cond:
+            self._running = False
+            self._ring.clear()
+            self._cond.notify_all()
+
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """Pop the oldest buffered item.
+
+        Blocks until an item is available. Returns ``None`` once the source
+        is exhausted and the ring is empty, or if ``timeout`` expires.
+        """
+        with self._cond:
+            ready = self._cond.wait_for(
+                lambda: self._ring or self.exhausted or not self._running,
+                timeout=timeout,
+            )
+            if not ready or not self._ring:
+                if self.error is not None:
+                    raise RuntimeError(
+                        f"{self.name} decoder thread failed"
+                    ) from self.error
+                return None
+
+            item = self._ring.popleft()
+            self._cond.notify_all()
+            return item
+
+    def _run(self) -> None:
+        while self._running:
+            try:
+                item = self.read_fn()
+            except Exception as e:
+                item = None
+                self.error = e
+
+            with self._cond:
+                if item is None:
+                    self.exhausted = True
+                    self._cond.notify_all()
+                    return
+
+                if self.policy == "block":
+                    self._cond.wait_for(
+                        lambda: len(self._ring) < self.depth
+                        or not self._running
+                    )
+                    if not self._running:
+                        return
+                elif len(self._ring) >= self.depth:
+                    self._ring.popleft()
+                    self.dropped += 1
+
+                self._ring.append(item)
+                self._cond.notify_all()
@@ -1,13 +1,12 @@
 import datetime
-import tempfile
-import time
 from typing import Optional, Union
 
 import pandas as pd
 
 import chimerapy.engine as cpe
 from chimerapy.orchestrator import source_node
-from chimerapy.pipelines.utils import download_file
+from chimerapy.pipelines.generic_nodes.pacing import PacingClock
+from chimerapy.pipelines.utils import cached_download
 
 
 @source_node(name="CPPipelines_LogReader")
@@ -16,10 +15,18 @@ class LogReader(cpe.Node):
 
     Parameters
     ----------
+    logfile: str, required
+        Path or url to the log file. Downloaded logs are kept in the package
+        cache
+    playback_speed: float, optional (default: 1.0)
+        The playback-speed multiplier. Each step emits one batch_window_size
+        of log data every batch_window_size / playback_speed seconds
     name: str, optional (default: "LogReader")
         The name of the node
     data_key: str, optional (default: "data")
         The key to use for the frame in the data chunk
+    logfile_sha256: str, optional (default: None)
+        The expected sha256 of a downloaded log file
     **kwargs
         Additional keyword arguments to pass to the Node constructor
     """
@@ -31,19 +38,22 @@ class LogReader(cpe.Node):
         timestamp_column: str = "timestamp",
         timestamp_format: Optional[str] = None,
         offset: Optional[Union[datetime.datetime, float]] = None,
-        sleep_factor: float = 0.95,
+        playback_speed: float = 1.0,
         name: str = "LogReader",
         data_key: str = "data",
+        logfile_sha256: Optional[str] = None,
         **kwargs,
     ) -> None:
 
         self.logfile = logfile
+        self.logfile_sha256 = logfile_sha256
         self.batch_window_size = batch_window_size
         self.timestamp_column = timestamp_column
         self.timestamp_format = timestamp_format
         self.offset = offset
         self.data_key = data_key
-        self.sleep_factor = sleep_factor
+        self.playback_speed = playback_speed
+        self.clock: Optional[PacingClock] = None
 
         self.first_pass = True
         self.step_id = 0
@@ -53,12 +63,10 @@ class LogReader(cpe.Node):
     def setup(self) -> None:
 
         if self.logfile.startswith("http"):
-            suffix = self.logfile.split(".")[-1]
-            with tempfile.NamedTemporaryFile(suffix=f".{suffix}") as f:
-                self.logfile = download_file(self.logfile, f.name)
-                self._read_logfile()
-        else:
-            self._read_logfile()
+            self.logfile = self.download_logfile(
+                self.logfile, self.logfile_sha256
+            )
+        self._read_logfile()
 
         # Convert string timestamps to datetime objects
         if self.timestamp_format:
@@ -101,6 +109,14 @@ class LogReader(cpe.Node):
         self.first_pass = True
         self.step_id = 0
 
+        # Windows are indexed in log time, so a late step catches up
+        # instead of skipping a window
+        self.clock = PacingClock(
+            1 / self.batch_window_size,
+            speed=self.playback_speed,
+            catch_up=True,
+        )
+
     def _read_logfile(self):
         if self.logfile.endswith(".csv"):
             self.data = pd.read_csv(self.logfile)
@@ -114,9 +130,9 @@ class LogReader(cpe.Node):
     def step(self) -> cpe.DataChunk:
         data_chunk = cpe.DataChunk()
 
-        # Get initial time
+        # Start the clock
         if self.step_id == 0:
-            self.initial = datetime.datetime.now()
+            self.clock.wait()
 
         # Compute the current datetime
         next_timestamp = (self.step_id + 1) * self.batch_window_size
@@ -132,10 +148,7 @@ class LogReader(cpe.Node):
         data_chunk.add(self.data_key, selected_data)
         self.stack = self.stack.iloc[stop_id:]
 
-        current_datetime = datetime.datetime.now()
-        delta = (current_datetime - self.initial).total_seconds()
-        sleep_time = max(next_timestamp - delta, 0)
-        time.sleep(sleep_time * self.sleep_factor)
+        self.clock.wait()
 
         # Update
         self.step_id += 1
@@ -143,7 +156,7 @@ class LogReader(cpe.Node):
         return data_chunk
 
     @staticmethod
-    def download_logfile(url: str, fname: str) -> str:
-        return download_file(
-            url, fname, chunk_size=1024, desc="Downloading weights"
+    def download_logfile(url: str, sha256: Optional[str] = None) -> str:
+        return str(
+            cached_download(url, sha256=sha256, desc="Downloading logfile")
         )
@@ -0,0 +1,236 @@
+import html
+import logging
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+BOUNDARY = "chimerapyframe"
+
+
+class _Stream:
+    """The latest frame of one source and its (lazily encoded) JPEG."""
+
+    def __init__(self) -> None:
+        self.frame: Optional[np.ndarray] = None
+        self.seq = 0
+        self.jpeg: Optional[bytes] = None
+        self.jpeg_seq = 0
+        self.encode_lock = threading.Lock()
+
+
+class MJPEGBroadcaster:
+    """Serves the latest frame of each source as a multipart MJPEG stream.
+
+    Publishing a frame only replaces the reference to the latest frame of its
+    source. A frame is JPEG-encoded at most once, the first time a viewer
+    needs it, and the encoded bytes are shared by all viewers. Every viewer
+    has its own thread and skips the frames published while it was busy, so
+    slow viewers never delay the publisher or each other.
+
+    Parameters
+    ----------
+    host : str, optional (default: "127.0.0.1")
+        The address the server listens on
+    port : int, optional (default: 8080)
+        The port the server listens on, 0 picks a free port
+    quality : int, optional (default: 80)
+        The JPEG quality
+    max_fps : float, optional (default: 15)
+        The maximum rate at which frames are sent to each viewer
+    logger : logging.Logger, optional
+        The logger used to report the server address
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        quality: int = 80,
+        max_fps: float = 15,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.quality = quality
+        self.max_fps = max_fps
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.encoded = 0
+        self.sent = 0
+        self.clients = 0
+
+        self._streams: Dict[str, _Stream] = {}
+        self._cond = threading.Condition()
+        self._running = False
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Optional[Tuple[str, int]]:
+        return self._server.server_address[:2] if self._server else None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def sources(self) -> List[str]:
+        with self._cond:
+            return list(self._streams)
+
+    def start(self) -> None:
+        handler = type("Handler", (_MJPEGHandler,), {"broadcaster": self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="MJPEGBroadcaster",
+            daemon=True,
+        )
+        self._thread.start()
+        host, port = self.address
+        self.logger.info(f"Serving MJPEG previews at http://{host}:{port}/")
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
+
+    def publish(self, source: str, frame: np.ndarray) -> None:
+        """Replace the latest frame of a source (it is not copied)."""
+        with self._cond:
+            stream = self._streams.setdefault(source, _Stream())
+            stream.frame = frame
+            stream.seq += 1
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "sources": len(self._streams),
+                "clients": self.clients,
+                "encoded": self.encoded,
+                "sent": self.sent,
+            }
+
+    def _count(self, clients: int = 0, encoded: int = 0, sent: int = 0) -> None:
+        """Update the counters, which are shared by the viewer threads."""
+        with self._cond:
+            self.clients += clients
+            self.encoded += encoded
+            self.sent += sent
+
+    def next_jpeg(
+        self, source: str, after_seq: int, timeout: float = 1.0
+    ) -> Optional[Tuple[int, bytes]]:
+        """Wait for a frame newer than ``after_seq`` and return it encoded.
+
+        Returns None if no newer frame is published within the timeout or
+        the broadcaster is stopped.
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: not self._running
+                or (
+                    source in self._streams
+                    and self._streams[source].seq > after_seq
+                ),
+                timeout=timeout,
+            )
+            stream = self._streams.get(source)
+            if not self._running or stream is None or stream.seq <= after_seq:
+                return None
+            frame, seq = stream.frame, stream.seq
+
+        with stream.encode_lock:
+            if stream.jpeg_seq < seq:
+                ok, buf = cv2.imencode(
+                    ".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+                )
+                if not ok:
+                    return None
+                stream.jpeg, stream.jpeg_seq = buf.tobytes(), seq
+                self._count(encoded=1)
+            return stream.jpeg_seq, stream.jpeg
+
+
+class _MJPEGHandler(BaseHTTPRequestHandler):
+    broadcaster: MJPEGBroadcaster
+
+    def do_GET(self) -> None:
+        path = urllib.parse.unquote(urllib.parse.urlparse(self.path).path)
+        if path in ("", "/"):
+            self._index()
+        elif path.startswith("/stream/"):
+            self._stream(path[len("/stream/") :])
+        else:
+            self.send_error(404)
+
+    def _index(self) -> None:
+        items = "".join(
+            f'<figure><img src="/stream/{urllib.parse.quote(source)}">'
+            f"<figcaption>{html.escape(source)}</figcaption></figure>"
+            for source in self.broadcaster.sources
+        )
+        body = (
+            "<html><head><title>ChimeraPy Preview</title></head>"
+            f'<body style="display:flex;flex-wrap:wrap">{items}</body></html>'
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, source: str) -> None:
+        broadcaster = self.broadcaster
+        self.send_response(200)
+        self.send_header(
+            "Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}"
+        )
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        interval = 1.0 / broadcaster.max_fps if broadcaster.max_fps else 0
+        seq = 0
+        broadcaster._count(clients=1)
+        try:
+            while broadcaster.running:
+                item = broadcaster.next_jpeg(source, seq)
+                if item is None:
+                    continue
+                seq, jpeg = item
+
+                sent_at = time.monotonic()
+                self.wfile.write(
+                    f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                    f"Content-Length: {len(jpeg)}\r\n\r\n".encode()
+                )
+                self.wfile.write(jpeg)
+                self.wfile.write(b"\r\n")
+                self.wfile.flush()
+                broadcaster._count(sent=1)
+
+                # Rate limit this viewer, frames published meanwhile are skipped
+                remaining = interval - (time.monotonic() - sent_at)
+                if remaining > 0:
+                    time.sleep(remaining)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            broadcaster._count(clients=-1)
+
+    def log_message(self, *args) -> None:
+        pass
@@ -0,0 +1,106 @@
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+import chimerapy.engine as cpe
+from chimerapy.orchestrator import sink_node
+from chimerapy.pipelines.generic_nodes.mjpeg import MJPEGBroadcaster
+
+
+@sink_node(name="CPPipelines_MJPEGServer")
+class MJPEGServer(cpe.Node):
+    """A node that serves its input frames as MJPEG streams over HTTP.
+
+    This is a display sink for headless workers. Open ``http://<host>:<port>/``
+    in a browser to view all the sources, or ``/stream/<source>`` for one.
+
+    Parameters
+    ----------
+    name : str, optional (default: 'MJPEGServer')
+        The name of the node
+    frames_key: str, optional (default: 'frame')
+        The key of the frames in the data chunks. Its value can be an image,
+        or a list of frame objects with ``arr`` and ``src_id`` attributes
+        (e.g. from MFSortVideo or YOLOVideo)
+    host: str, optional (default: '127.0.0.1')
+        The address to listen on. Use '0.0.0.0' to serve remote viewers
+    port: int, optional (default: 8080)
+        The port to listen on
+    quality: int, optional (default: 80)
+        The JPEG quality of the streams
+    max_fps: float, optional (default: 15)
+        The maximum frame rate sent to each viewer
+    **kwargs
+        Additional keyword arguments to pass to the Node constructor
+
+    Notes
+    -----
+        Each frame is encoded at most once, and only if a viewer is
+        watching its source; all the viewers of a source share the encoded
+        frame. Viewers always receive the latest frame and slow viewers skip
+        frames, so viewers never slow the pipeline down.
+    """
+
+    def __init__(
+        self,
+        name: str = "MJPEGServer",
+        frames_key: str = "frame",
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        quality: int = 80,
+        max_fps: float = 15,
+        **kwargs,
+    ) -> None:
+        self.frames_key = frames_key
+        self.host = host
+        self.port = port
+        self.quality = quality
+        self.max_fps = max_fps
+        self.broadcaster: Optional[MJPEGBroadcaster] = None
+        super().__init__(name=name, **kwargs)
+
+    def setup(self) -> None:
+        self.broadcaster = MJPEGBroadcaster(
+            host=self.host,
+            port=self.port,
+            quality=self.quality,
+            max_fps=self.max_fps,
+            logger=self.logger,
+        )
+        self.broadcaster.start()
+
+    def step(self, data_chunks: Dict[str, cpe.DataChunk]) -> None:
+        for name, data_chunk in data_chunks.items():
+            value = data_chunk.get(self.frames_key)["value"]
+            if isinstance(value, np.ndarray):
+                maybe_metadata = data_chunk.get("metadata")
+                self.broadcaster.publish(
+                    self._get_source_id(
+                        name,
+                        maybe_metadata["value"] if maybe_metadata else None,
+                    ),
+                    value,
+                )
+            else:
+                for frame in value:
+                    self.broadcaster.publish(
+                        f"{name}_{frame.src_id}", frame.arr
+                    )
+
+    @staticmethod
+    def _get_source_id(
+        src_name: str, metadata: Optional[Dict[str, Any]]
+    ) -> str:
+        source_id = src_name
+        if metadata:
+            src_id = metadata.get("source_id", "")
+            if src_id:
+                source_id = f"{src_name}_{src_id[0:6]}"
+
+        return source_id
+
+    def teardown(self) -> None:
+        if self.broadcaster is not None:
+            self.logger.info(f"{self}: MJPEG stats {self.broadcaster.stats()}")
+            self.broadcaster.stop()
+            self.broadcaster = None
@@ -0,0 +1,122 @@
+import time
+from typing import Callable, Dict, Optional, Union
+
+
+class PacingClock:
+    """A drift-free rate limiter for source nodes.
+
+    Deadlines are computed from a fixed start time on a monotonic clock
+    (``start + tick * interval``) rather than by sleeping a fixed amount after
+    each step, so time spent in ``step`` does not accumulate as drift.
+
+    Parameters
+    ----------
+    rate : float
+        The nominal rate, in ticks per second
+    speed : float, optional (default: 1.0)
+        The playback-speed multiplier. 2.0 ticks twice as fast as ``rate``
+    catch_up : bool, optional (default: False)
+        What to do when one or more deadlines have already passed. If False,
+        the missed deadlines are skipped (and counted as dropped) so the
+        source continues at its nominal rate. If True, the clock returns
+        immediately until it is back on schedule
+    clock : Callable[[], float], optional (default: time.monotonic)
+        The clock used to measure time
+    sleep : Callable[[float], None], optional (default: time.sleep)
+        The function used to wait until the next deadline
+
+    Notes
+    -----
+        A tick is counted as late when ``wait`` is called after its deadline,
+        i.e. when the previous step took longer than one interval. A tick is
+        counted as dropped when its deadline was missed entirely and skipped.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        speed: float = 1.0,
+        catch_up: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError(f"Pacing rate must be positive, got {rate}")
+
+        if speed <= 0:
+            raise ValueError(f"Playback speed must be positive, got {speed}")
+
+        self.rate = rate
+        self.speed = speed
+        self.catch_up = catch_up
+        self._clock = clock
+        self._sleep = sleep
+
+        self.reset()
+
+    @property
+    def interval(self) -> float:
+        """The time between two deadlines, in seconds."""
+        return 1.0 / (self.rate * self.speed)
+
+    def reset(self) -> None:
+        """Restart the clock. The next call to ``wait`` returns immediately."""
+        self.start: Optional[float] = None
+        self.tick = 0
+        self.late = 0
+        self.dropped = 0
+        self.max_lateness = 0.0
+
+    def set_speed(self, speed: float) -> None:
+        """Change the playback speed without jumping in the schedule."""
+        if speed <= 0:
+            raise ValueError(f"Playback speed must be positive, got {speed}")
+
+        if self.start is not None:
+            now = self._clock()
+            elapsed_ticks = (now - self.start) / self.interval
+            self.speed = speed
+            self.start = now - elapsed_ticks * self.interval
+        else:
+            self.speed = speed
+
+    def wait(self) -> float:
+        """Wait for the next deadline.
+
+        Returns
+        -------
+        float
+            How late, in seconds, the call was with respect to its deadline
+            (0.0 if it was on time)
+        """
+        now = self._clock()
+        if self.start is None:
+            self.start = now
+            return 0.0
+
+        self.tick += 1
+        deadline = self.start + self.tick * self.interval
+
+        if now < deadline:
+            self._sleep(deadline - now)
+            return 0.0
+
+        lateness = now - deadline
+        self.late += 1
+        self.max_lateness = max(self.max_lateness, lateness)
+
+        missed = int(lateness // self.interval)
+        if missed > 0 and not self.catch_up:
+            self.tick += missed
+            self.dropped += missed
+
+        return lateness
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """The pacing counters, suitable for metadata or logging."""
+        return {
+            "ticks": self.tick,
+            "late": self.late,
+            "dropped": self.dropped,
+            "max_lateness": self.max_lateness,
+        }
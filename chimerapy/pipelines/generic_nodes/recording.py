@@ -0,0 +1,27 @@
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    import chimerapy.engine as cpe
+
+
+def on_recording_stopped(
+    node: "cpe.Node", callback: Callable[[], None]
+) -> None:
+    """Call ``callback`` when the node is stopped, before its data is collected.
+
+    The worker collects the node's log directory as soon as the node has been
+    stopped and its recorder has finished, which is before ``teardown``. Files
+    written by the node itself (rather than through ``save_*``) must therefore
+    be flushed and closed when the node stops. Does nothing if the node is not
+    run by the engine (e.g. when stepped manually in tests).
+    """
+    eventbus = getattr(node, "eventbus", None)
+    if eventbus is None:
+        return
+
+    from chimerapy.engine.eventbus import TypedObserver
+
+    # setup runs on the event loop, so the subscription is not awaited
+    eventbus.subscribe(
+        TypedObserver("stop", on_asend=callback, handle_event="drop")
+    )
@@ -2,11 +2,16 @@ import typing
 from datetime import datetime
 
 import cv2
-import imutils
 import numpy as np
 
 import chimerapy.engine as cpe
 from chimerapy.orchestrator import source_node
+from chimerapy.pipelines.generic_nodes.buffer_pool import (
+    FrameBufferPool,
+    resize_dims,
+)
+from chimerapy.pipelines.generic_nodes.pacing import PacingClock
+from chimerapy.pipelines.generic_nodes.video_writer import AsyncVideoWriter
 
 if typing.TYPE_CHECKING:
     from mss.base import MSSBase
@@ -23,7 +28,9 @@ class ScreenCapture(cpe.Node):
     scale: float, optional (default: 0.5)
         The scale of the screen capture
     fps: int, optional (default: 30)
-        The frame rate of the screen capture (unused, not guaranteed)
+        The frame rate of the screen capture. Captures are paced against a
+        monotonic clock; a capture that overruns its deadline is counted as
+        late and the missed deadlines are skipped
     frame_key: str, optional (default: 'frame')
         The key to use for the frame in the data chunk
     monitor: int, optional (default: 0)
@@ -32,6 +39,9 @@ class ScreenCapture(cpe.Node):
          If a string is provided, save the video (prefixed with this name)
     save_timestamp: bool, optional (default: False)
         If True, append a timestamp to the frames when saving (top left corner)
+    buffer_pool_size: int, optional (default: 0)
+        If positive, write the emitted frames into a ring of this many
+        preallocated buffers instead of allocating a new array every step
     """
 
     def __init__(
@@ -43,18 +53,33 @@ class ScreenCapture(cpe.Node):
         name="ScreenCaptureNode",
         save_name: typing.Optional[str] = None,
         save_timestamp: bool = False,
+        buffer_pool_size: int = 0,
     ):
         self.scale = scale
         self.fps = fps
         self.frame_key = frame_key
         self.capture = None
+        self.clock: typing.Optional[PacingClock] = None
         self.monitor = monitor
         self.save_name = save_name
         self.save_timestamp = save_timestamp
+        self.buffer_pool_size = buffer_pool_size
+        self.scratch_pool: typing.Optional[FrameBufferPool] = None
+        self.output_pool: typing.Optional[FrameBufferPool] = None
+        self.video_writer: typing.Optional[AsyncVideoWriter] = None
         super().__init__(name=name)
 
     def setup(self):
         self.capture = None
+        self.clock = PacingClock(self.fps)
+
+        # The downscaled BGRA frame never leaves step, so one buffer suffices
+        self.scratch_pool = FrameBufferPool(1)
+        if self.buffer_pool_size > 0:
+            self.output_pool = FrameBufferPool(self.buffer_pool_size)
+
+        if self.save_name:
+            self.video_writer = AsyncVideoWriter.for_node(self)
 
     def _get_capture(self) -> "MSSBase":
         import mss
@@ -65,20 +90,55 @@ class ScreenCapture(cpe.Node):
 
     def step(self) -> cpe.DataChunk:
         img = self._get_capture().grab(self.capture.monitors[self.monitor])
-        arr = np.array(img)
-        arr = cv2.cvtColor(arr, cv2.COLOR_BGRA2BGR)
-        arr = imutils.resize(arr, width=int(arr.shape[1] * self.scale))
+
+        # View the raw BGRA pixels without copying, downscale before the color
+        # conversion so it touches fewer pixels
+        bgra = np.frombuffer(img.raw, dtype=np.uint8).reshape(
+            img.height, img.width, 4
+        )
+        w, h = resize_dims(bgra.shape, int(img.width * self.scale), None)
+        if (w, h) != (img.width, img.height):
+            scratch = self.scratch_pool.acquire((h, w, 4))
+            bgra = cv2.resize(
+                bgra, (w, h), dst=scratch, interpolation=cv2.INTER_AREA
+            )
+
+        dst = None
+        if self.output_pool is not None:
+            dst = self.output_pool.acquire((h, w, 3))
+        arr = cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=dst)
+
         if self.save_timestamp:
             arr = self.append_timestamp(arr)
 
-        if self.save_name:
-            self.save_video(self.save_name, arr, self.fps)
+        if self.video_writer is not None:
+            self.video_writer.submit(self.save_name, arr, self.fps)
 
         data_chunk = cpe.DataChunk()
         data_chunk.add(self.frame_key, arr, "image")
 
+        self.clock.wait()
+
         return data_chunk
 
+    def teardown(self):
+        if self.video_writer is not None:
+            self.video_writer.close()
+            self.logger.info(
+                f"{self}: video writer stats {self.video_writer.stats()}"
+            )
+
+        if self.clock is not None:
+            self.logger.info(f"{self}: pacing stats {self.clock.stats()}")
+        if self.output_pool is not None:
+            self.logger.info(
+                f"{self}: buffer pool stats {self.output_pool.stats()}"
+            )
+
+        if self.capture is not None:
+            self.capture.close()
+            self.capture = None
+
     def append_timestamp(self, arr):
         timestamp = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
         cv2.putText(
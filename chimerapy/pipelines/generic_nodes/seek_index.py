@@ -0,0 +1,120 @@
+import bisect
+import hashlib
+import json
+import os
+import pathlib
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+from chimerapy.pipelines.utils import get_cache_dir
+
+INDEX_SUFFIX = ".seekidx.json"
+
+
+@dataclass
+class SeekIndex:
+    """The presentation timestamps and keyframes of a video file.
+
+    Frames are numbered in presentation order, as they are returned by
+    ``cv2.VideoCapture``.
+
+    Parameters
+    ----------
+    fps : float
+        The average frame rate of the video
+    pts : List[float]
+        The presentation timestamp of every frame, in seconds
+    keyframes : List[int]
+        The indices of the keyframes, in increasing order
+    size : int
+        The size of the indexed file, used to detect stale indices
+    mtime_ns : int
+        The modification time of the indexed file
+    """
+
+    fps: float
+    pts: List[float]
+    keyframes: List[int]
+    size: int = 0
+    mtime_ns: int = 0
+
+    def __len__(self) -> int:
+        return len(self.pts)
+
+    def frame_at(self, t: float) -> int:
+        """The index of the first frame presented at or after ``t`` seconds."""
+        return bisect.bisect_left(self.pts, self.pts[0] + t) if self.pts else 0
+
+    def keyframe_before(self, frame: int) -> int:
+        """The index of the last keyframe at or before ``frame``."""
+        i = bisect.bisect_right(self.keyframes, frame) - 1
+        return self.keyframes[i] if i >= 0 else 0
+
+    @classmethod
+    def build(cls, fname: str) -> "SeekIndex":
+        """Index a video by demuxing its packets, without decoding them."""
+        import av
+
+        stat = os.stat(fname)
+        with av.open(fname) as container:
+            stream = container.streams.video[0]
+            packets = [
+                (float(packet.pts * stream.time_base), packet.is_keyframe)
+                for packet in container.demux(stream)
+                if packet.pts is not None
+            ]
+            fps = float(stream.average_rate or 0)
+
+        packets.sort()
+        return cls(
+            fps=fps,
+            pts=[pts for pts, _ in packets],
+            keyframes=[i for i, (_, key) in enumerate(packets) if key] or [0],
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+        )
+
+    @classmethod
+    def for_file(cls, fname: str) -> Optional["SeekIndex"]:
+        """Load the cached index of a video, building it on first use.
+
+        The index is cached next to the video (``<video>.seekidx.json``), or
+        in the package cache directory if that location is not writable.
+        Returns None if PyAV is not installed.
+        """
+        stat = os.stat(fname)
+        for path in _index_paths(fname):
+            if not path.exists():
+                continue
+            try:
+                with open(path) as f:
+                    index = cls(**json.load(f))
+            except (json.JSONDecodeError, TypeError):
+                continue
+            if (index.size, index.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                return index
+
+        try:
+            index = cls.build(fname)
+        except ImportError:
+            return None
+
+        for path in _index_paths(fname):
+            try:
+                with open(path, "w") as f:
+                    json.dump(asdict(index), f)
+                break
+            except OSError:
+                continue
+
+        return index
+
+
+def _index_paths(fname: str) -> List[pathlib.Path]:
+    """Where the index of a video may be cached, in order of preference."""
+    abspath = os.path.abspath(fname)
+    digest = hashlib.sha256(abspath.encode()).hexdigest()[:32]
+    return [
+        pathlib.Path(abspath + INDEX_SUFFIX),
+        get_cache_dir("seek") / f"{digest}{INDEX_SUFFIX}",
+    ]
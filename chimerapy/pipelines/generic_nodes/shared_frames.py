@@ -0,0 +1,203 @@
+import sys
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Each slot starts with the sequence number of the frame it holds
+_HEADER_NBYTES = 64
+_SEQ_WRITING = -1
+
+# Segments mapped by this process, keyed by segment name
+_segments: Dict[str, shared_memory.SharedMemory] = {}
+
+
+class StaleFrameError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class SharedFrameHandle:
+    """The location of a frame in a shared-memory ring."""
+
+    segment: str
+    offset: int
+    shape: Tuple[int, ...]
+    dtype: str
+    seq: int
+
+    def open(self) -> np.ndarray:
+        """Map the frame into a read-only array, without copying.
+
+        The slot is shared by every consumer of the ring, so the view is not
+        writable: copy it before drawing on it.
+        """
+        shm = _attach(self.segment)
+        if self._stored_seq(shm) != self.seq:
+            raise StaleFrameError(
+                f"Frame {self.seq} in {self.segment} was recycled before it "
+                "was read, increase the number of shared memory slots"
+            )
+
+        arr = np.ndarray(
+            self.shape,
+            dtype=np.dtype(self.dtype),
+            buffer=shm.buf,
+            offset=self.offset + _HEADER_NBYTES,
+        )
+        arr.setflags(write=False)
+        return arr
+
+    def is_current(self) -> bool:
+        """Whether the slot still holds this frame."""
+        try:
+            return self._stored_seq(_attach(self.segment)) == self.seq
+        except StaleFrameError:
+            return False
+
+    def maps(self, arr: np.ndarray) -> bool:
+        """Whether the array is the mapped view of this frame."""
+        shm = _segments.get(self.segment)
+        if shm is None or arr is None:
+            return False
+
+        base = np.frombuffer(shm.buf, dtype=np.uint8, count=1).ctypes.data
+        return (
+            arr.ctypes.data == base + self.offset + _HEADER_NBYTES
+            and arr.shape == tuple(self.shape)
+        )
+
+    def _stored_seq(self, shm: shared_memory.SharedMemory) -> int:
+        return int(_header(shm, self.offset)[0])
+
+
+class SharedFrameRing:
+    """A ring of fixed-size frame slots in one shared memory segment.
+
+    A source writes each frame into the next slot and ships the small
+    ``SharedFrameHandle`` instead of the pixels; consumers on the same machine
+    map the slot back into an array without copying.
+
+    Parameters
+    ----------
+    slots : int
+        The number of frames the ring holds before a slot is reused
+    slot_nbytes : int
+        The maximum size of a frame, in bytes
+
+    Notes
+    -----
+        Slots are reused in order: the slot of frame ``n`` is overwritten when
+        frame ``n + slots`` is written. A consumer must finish with a mapped
+        frame (or copy it) before the producer has written ``slots`` more
+        frames; ``SharedFrameHandle.is_current`` tells whether that still
+        holds. Mapping a frame whose slot was reused, or whose ring was closed
+        by the producer, raises ``StaleFrameError``.
+    """
+
+    def __init__(self, slots: int, slot_nbytes: int) -> None:
+        if slots < 1:
+            raise ValueError(f"Ring must have at least one slot, got {slots}")
+
+        self.slots = slots
+        self.slot_nbytes = slot_nbytes
+        self.stride = _HEADER_NBYTES + _align(slot_nbytes, _HEADER_NBYTES)
+        self.seq = 0
+
+        self.shm: Optional[
+            shared_memory.SharedMemory
+        ] = shared_memory.SharedMemory(create=True, size=slots * self.stride)
+        _segments[self.shm.name] = self.shm
+
+        for slot in range(slots):
+            _header(self.shm, slot * self.stride)[0] = _SEQ_WRITING
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def fits(self, arr: np.ndarray) -> bool:
+        return arr.nbytes <= self.slot_nbytes
+
+    def write(self, arr: np.ndarray) -> Tuple[np.ndarray, SharedFrameHandle]:
+        """Copy the frame into the next slot.
+
+        Returns the read-only mapped view of the slot and the handle to ship
+        downstream.
+        """
+        if not self.fits(arr):
+            raise ValueError(
+                f"Frame of {arr.nbytes} bytes does not fit in a "
+                f"{self.slot_nbytes} bytes slot"
+            )
+
+        offset = (self.seq % self.slots) * self.stride
+        header = _header(self.shm, offset)
+
+        # Invalidate the slot while it is being overwritten
+        header[0] = _SEQ_WRITING
+        view = np.ndarray(
+            arr.shape,
+            dtype=arr.dtype,
+            buffer=self.shm.buf,
+            offset=offset + _HEADER_NBYTES,
+        )
+        np.copyto(view, arr)
+        view.setflags(write=False)
+        header[0] = self.seq
+
+        handle = SharedFrameHandle(
+            segment=self.shm.name,
+            offset=offset,
+            shape=tuple(arr.shape),
+            dtype=arr.dtype.str,
+            seq=self.seq,
+        )
+        self.seq += 1
+
+        return view, handle
+
+    def close(self) -> None:
+        """Release the segment. Frames not yet mapped become stale."""
+        if self.shm is None:
+            return
+
+        _segments.pop(self.shm.name, None)
+        self.shm.unlink()
+        try:
+            self.shm.close()
+        except BufferError:
+            # Frames still reference the mapping, it is released at exit
+            pass
+        self.shm = None
+
+
+def _header(shm: shared_memory.SharedMemory, offset: int) -> np.ndarray:
+    return np.ndarray((1,), dtype=np.int64, buffer=shm.buf, offset=offset)
+
+
+def _align(nbytes: int, alignment: int) -> int:
+    return -(-nbytes // alignment) * alignment
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    shm = _segments.get(name)
+    if shm is not None:
+        return shm
+
+    try:
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            # Only the producer may unlink the segment
+            resource_tracker.unregister(shm._name, "shared_memory")
+    except FileNotFoundError as e:
+        raise StaleFrameError(
+            f"Shared memory segment {name} is not available; it was released "
+            "by its producer or lives on another machine"
+        ) from e
+
+    _segments[name] = shm
+    return shm
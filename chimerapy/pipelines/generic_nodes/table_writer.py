@@ -0,0 +1,192 @@
+import pathlib
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Union,
+)
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+Columns = Dict[str, Union[np.ndarray, List[Any]]]
+
+
+class BufferedTableWriter:
+    """Buffers column batches and writes them together.
+
+    Appending only keeps a reference to the columns. The buffered batches are
+    concatenated and passed to ``write_fn`` once ``flush_rows`` rows are
+    buffered or ``flush_interval`` seconds have passed since the last write,
+    and on ``close``.
+
+    Parameters
+    ----------
+    write_fn : Callable[[Columns], None]
+        Writes a batch of columns. Array columns are concatenated along their
+        first axis, list columns are joined
+    flush_rows : int, optional (default: 5000)
+        The number of buffered rows that triggers a write
+    flush_interval : float, optional (default: 5.0)
+        The maximum time, in seconds, rows are buffered before being written
+    """
+
+    def __init__(
+        self,
+        write_fn: Callable[[Columns], None],
+        flush_rows: int = 5000,
+        flush_interval: float = 5.0,
+    ) -> None:
+        self.write_fn = write_fn
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+
+        self.rows = 0
+        self.writes = 0
+        self._batches: List[Columns] = []
+        self._last_flush = time.monotonic()
+
+    def append(self, columns: Columns) -> None:
+        n_rows = len(next(iter(columns.values()), []))
+        if n_rows:
+            self._batches.append(columns)
+            self.rows += n_rows
+
+        if (
+            self.rows >= self.flush_rows
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._batches:
+            return
+
+        batches, self._batches, self.rows = self._batches, [], 0
+        columns: Columns = {}
+        for key, first in batches[0].items():
+            parts = [batch[key] for batch in batches]
+            if isinstance(first, np.ndarray):
+                columns[key] = np.concatenate(parts)
+            else:
+                columns[key] = [value for part in parts for value in part]
+
+        self.write_fn(columns)
+        self.writes += 1
+
+    def close(self) -> None:
+        self.flush()
+
+
+class ArrowFileSink:
+    """Appends column batches to a Parquet or Arrow IPC file.
+
+    Every batch becomes one Parquet row group (or IPC record batch). Requires
+    ``pyarrow``. Multi-dimensional array columns are stored as fixed size lists, and list
+    columns of arrays as variable size lists.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The file to write
+    file_format : Literal["parquet", "arrow"], optional (default: "parquet")
+        The format of the file
+    """
+
+    def __init__(
+        self,
+        path: Union[str, pathlib.Path],
+        file_format: Literal["parquet", "arrow"] = "parquet",
+    ) -> None:
+        import pyarrow  # noqa: F401
+
+        self.path = pathlib.Path(path)
+        self.file_format = file_format
+        self._writer = None
+
+    def write(self, columns: Columns) -> None:
+        import pyarrow as pa
+
+        table = pa.table(
+            {key: _to_arrow(value) for key, value in columns.items()}
+        )
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.file_format == "parquet":
+                import pyarrow.parquet as pq
+
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                self._writer = pa.ipc.new_file(self.path, table.schema)
+
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class CSVFileSink:
+    """Appends column batches to a CSV file.
+
+    The header is written if the file does not exist yet, like the engine's
+    tabular records. Unlike ``Node.save_tabular``, the rows are written
+    directly, so batches can still be written while the node is stopping.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The file to write
+    to_dataframe : Callable[[Columns], pd.DataFrame], optional
+        Converts a batch of columns to a DataFrame. Defaults to
+        ``pd.DataFrame``
+    """
+
+    def __init__(
+        self,
+        path: Union[str, pathlib.Path],
+        to_dataframe: Optional[Callable[[Columns], "pd.DataFrame"]] = None,
+    ) -> None:
+        self.path = pathlib.Path(path)
+        self.to_dataframe = to_dataframe
+
+    def write(self, columns: Columns) -> None:
+        import pandas as pd
+
+        df = (self.to_dataframe or pd.DataFrame)(columns)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(
+            self.path, mode="a", header=not self.path.exists(), index=False
+        )
+
+    def close(self) -> None:
+        pass
+
+
+def _to_arrow(column: Union[np.ndarray, List[Any]]):
+    import pyarrow as pa
+
+    if isinstance(column, np.ndarray):
+        if column.ndim == 1:
+            return pa.array(column)
+        # Nest fixed size lists from the last axis outwards
+        arr = pa.array(np.ascontiguousarray(column).reshape(-1))
+        for size in reversed(column.shape[1:]):
+            arr = pa.FixedSizeListArray.from_arrays(arr, size)
+        return arr
+
+    return pa.array(
+        [
+            value.tolist() if isinstance(value, np.ndarray) else value
+            for value in column
+        ]
+    )
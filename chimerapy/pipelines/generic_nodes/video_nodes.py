@@ -1,8 +1,6 @@
-import datetime
-import os
-import tempfile
+import threading
 import time
-from typing import Any, Dict, Optional, Tuple, Union
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 
 import cv2
 import imutils
@@ -10,7 +8,16 @@ import numpy as np
 
 import chimerapy.engine as cpe
 from chimerapy.orchestrator import sink_node, source_node
-from chimerapy.pipelines.utils import download_file
+from chimerapy.pipelines.generic_nodes.buffer_pool import (
+    FrameBufferPool,
+    resize_dims,
+)
+from chimerapy.pipelines.generic_nodes.frame_cache import DecodedFrameCache
+from chimerapy.pipelines.generic_nodes.frame_prefetcher import FramePrefetcher
+from chimerapy.pipelines.generic_nodes.pacing import PacingClock
+from chimerapy.pipelines.generic_nodes.seek_index import SeekIndex
+from chimerapy.pipelines.generic_nodes.video_writer import AsyncVideoWriter
+from chimerapy.pipelines.utils import cached_download, cached_path
 
 
 @source_node(name="CPPipelines_Video")
@@ -31,22 +38,85 @@ class Video(cpe.Node):
         The video source. This can be a local file path or a webcam index
     frame_rate: int, optional (default: 30)
         The frame rate of the video, in frames per second
+    playback_speed: float, optional (default: 1.0)
+        The playback-speed multiplier applied to frame_rate
     frame_key: str, optional (default: 'frame')
         The key to use for the frame in the data chunk
     include_meta: bool, optional (default: False)
         Whether to include the metadata in the data chunk
     loop: bool, optional (default: False)
         Whether to loop the video when it reaches the end
+    download_video: bool, optional (default: False)
+        If True and video_src is a url, download the video into the package
+        cache (once) and play the local copy instead of streaming it. A url
+        already in the cache (e.g. prefetched with
+        ``python -m chimerapy.pipelines.prefetch``) is always played locally
+    video_sha256: str, optional (default: None)
+        The expected sha256 of a downloaded video
     save_name: str, optional (default: None)
-        If a string is provided, save the video (prefixed with this name)
+        If a string is provided, save the video (prefixed with this name). The
+        video is encoded on a background thread
+    prefetch: bool, optional (default: False)
+        If True, read and resize frames on a dedicated decoder thread so that
+        step only pops already decoded frames
+    prefetch_depth: int, optional (default: 8)
+        The maximum number of decoded frames buffered by the decoder thread
+    prefetch_policy: Literal["block", "drop_oldest"], optional (default: "block")
+        What the decoder thread does when the buffer is full. ``block`` waits
+        for step to consume a frame, ``drop_oldest`` discards the oldest frame
+    buffer_pool_size: int, optional (default: 0)
+        If positive, capture and resize frames into a ring of this many
+        preallocated buffers instead of allocating new arrays every step. It
+        must exceed the number of emitted frames still in flight (not yet
+        published) when a buffer is reused; the prefetch depth and the batch
+        size of subclasses emitting batches are added automatically
+    cache_frames: bool, optional (default: False)
+        If True, store the decoded and resized frames of a file source in an
+        on-disk memory-mapped cache keyed by the file content, the target size
+        and the codec. Once a complete pass is cached, later passes and later
+        runs read frames from the cache instead of decoding the video. URL
+        sources are only cached when downloaded (see download_video). Frames
+        replayed from the cache are not saved (see save_name)
+    cache_dir: str, optional (default: None)
+        The directory of the frame cache, defaults to the package cache
+        directory (see ``CHIMERAPY_PIPELINES_CACHE``)
+    start_time: float, optional (default: None)
+        If provided, start playing at this time (in seconds) of the video
+    end_time: float, optional (default: None)
+        If provided, stop playing (or loop back to the start) at this time (in
+        seconds) of the video
+    start_frame: int, optional (default: None)
+        If provided, start playing at this frame. Takes precedence over
+        start_time
+    decimate: int, optional (default: None)
+        If provided, only emit every ``decimate``-th frame of the video
+    target_fps: float, optional (default: None)
+        If provided (and decimate is not), only emit frames at approximately
+        this rate, by skipping frames of the source video
     **kwargs
         Additional keyword arguments to pass to the Node constructor
 
     Notes
     -----
-        The frame_rate is not guaranteed to be exact. It is only a best effort.
-
-    ToDo: Research and Implement a proper frame rate limiter
+        Seeking in a local file uses a keyframe/timestamp index built on first
+        open and cached next to the file (``<video>.seekidx.json``): the video
+        is positioned on the nearest preceding keyframe and decoded forward to
+        the requested frame. Building the index requires PyAV (``av``);
+        without it, seeking falls back to the OpenCV backend, which may be
+        slow or inaccurate for some codecs.
+
+        When decimating, skipped frames are only grabbed (advanced past) and
+        never retrieved, converted or resized. frame_rate remains the rate of
+        the source frames, so frames are emitted at frame_rate / stride, and
+        frame_count advances by the stride so that it keeps counting source
+        frames.
+
+        Frames are paced against absolute deadlines on a monotonic clock. If
+        a step overruns, the missed deadlines are skipped rather than bursting
+        to catch up. The metadata reports the number of late steps
+        (``late_frames``) and of skipped pacing deadlines (``skipped_ticks``).
+        Skipped deadlines are not dropped source frames: the next step reads
+        the next frame of the source.
     """
 
     def __init__(
@@ -56,74 +126,369 @@ class Video(cpe.Node):
         width: Optional[int] = 640,
         height: Optional[int] = 480,
         frame_rate: int = 30,
+        playback_speed: float = 1.0,
         frame_key: str = "frame",
         include_meta: bool = False,
         loop: bool = False,
         download_video: bool = False,
         save_name: Optional[str] = None,
+        prefetch: bool = False,
+        prefetch_depth: int = 8,
+        prefetch_policy: Literal["block", "drop_oldest"] = "block",
+        buffer_pool_size: int = 0,
+        cache_frames: bool = False,
+        cache_dir: Optional[str] = None,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        start_frame: Optional[int] = None,
+        decimate: Optional[int] = None,
+        target_fps: Optional[float] = None,
+        video_sha256: Optional[str] = None,
         **kwargs,
     ) -> None:
         self.video_src = video_src
         self.width = width
         self.height = height
         self.frame_rate = frame_rate
+        self.playback_speed = playback_speed
         self.include_meta = include_meta
         self.frame_key = frame_key
         self.cp: Optional[cv2.VideoCapture] = None
         self.frame_count = 0
-        self.sleep_factor = 0.95
+        self.clock: Optional[PacingClock] = None
         self.debug = kwargs.get("debug", False)
         self.download_video = download_video
+        self.video_sha256 = video_sha256
         self.loop = loop
         self.save_name = save_name
+        self.video_writer: Optional[AsyncVideoWriter] = None
+        self.prefetch = prefetch
+        self.prefetch_depth = prefetch_depth
+        self.prefetch_policy = prefetch_policy
+        self.prefetcher: Optional[FramePrefetcher] = None
+        self.buffer_pool_size = buffer_pool_size
+        self.capture_pool: Optional[FrameBufferPool] = None
+        self.output_pool: Optional[FrameBufferPool] = None
+        self._capture_shape: Optional[Tuple[int, ...]] = None
+        self._read_error_frame: Optional[np.ndarray] = None
+        self.cache_frames = cache_frames
+        self.cache_dir = cache_dir
+        self.frame_cache: Optional[DecodedFrameCache] = None
+        self.cached_frames: Optional[np.ndarray] = None
+        self._cache_index = 0
+        self.start_time = start_time
+        self.end_time = end_time
+        self.start_frame = start_frame
+        self.seek_index: Optional[SeekIndex] = None
+        self._start = 0
+        self._end: Optional[int] = None
+        self._position = 0
+        self.decimate = decimate
+        self.target_fps = target_fps
+        self.stride = 1
+        self.batch_size = 1
         super().__init__(name=name, **kwargs)
 
     def setup(self) -> None:
-        if self.download_video:
-            self.logger.info("Downloading video")
-            self.video_src = self.download_video_from_url(self.video_src)
+        if isinstance(self.video_src, str) and self.video_src.startswith(
+            "http"
+        ):
+            cached = cached_path(self.video_src, self.video_sha256)
+            if cached is not None:
+                self.video_src = str(cached)
+            elif self.download_video:
+                self.logger.info("Downloading video")
+                self.video_src = self.download_video_from_url(
+                    self.video_src, self.video_sha256
+                )
 
         self.cp = cv2.VideoCapture(self.video_src)
         self.frame_count = 0
+        self._position = 0
 
-    def step(self) -> cpe.DataChunk:
-        data_chunk = cpe.DataChunk()
-        ret, frame = self.cp.read()
+        self._start, self._end = self._resolve_range()
+        if self._start > 0:
+            self._seek(self._start)
 
-        if not ret:
-            if self.loop:
-                self.logger.info("Restarting video")
-                if isinstance(
-                    self.video_src, str
-                ) and self.video_src.startswith("http"):
-                    self.cp.release()
-                    self.cp = cv2.VideoCapture(self.video_src)
-                else:
-                    self.cp.set(cv2.CAP_PROP_POS_FRAMES, 0)
-
-                ret, frame = self.cp.read()
-                if self.save_name is not None:
-                    self.save_video(self.save_name, frame, self.frame_rate)
-            else:
-                self.logger.error("Could not read frame from video source")
-                h = self.height or 480
-                w = self.width or 640
-                frame = np.zeros((h, w, 3), dtype=np.uint8)
-                cv2.putText(
-                    frame,
-                    "Read Error",
-                    (h // 2, w // 2),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    1,
-                    (0, 0, 255),
-                    2,
+        self.stride = self._resolve_stride()
+        self.clock = PacingClock(
+            self.frame_rate / self.stride, speed=self.playback_speed
+        )
+
+        if self.save_name is not None:
+            self.video_writer = AsyncVideoWriter.for_node(self)
+
+        if self.cache_frames:
+            self._setup_frame_cache()
+
+        if self.buffer_pool_size > 0:
+            pool_size = self.buffer_pool_size
+            if self.prefetch:
+                pool_size += self.prefetch_depth + 1
+            pool_size += self.batch_size - 1
+            self.capture_pool = FrameBufferPool(pool_size)
+            self.output_pool = FrameBufferPool(pool_size)
+            self._capture_shape = None
+
+        if self.prefetch:
+            self.prefetcher = FramePrefetcher(
+                self._read_frame,
+                depth=self.prefetch_depth,
+                policy=self.prefetch_policy,
+                name=f"{self.name}-decoder",
+            )
+            self.prefetcher.start()
+
+    def _setup_frame_cache(self) -> None:
+        if not isinstance(self.video_src, str) or self.video_src.startswith(
+            "http"
+        ):
+            self.logger.warning(
+                f"{self}: frame caching is only supported for file and "
+                "downloaded URL sources, decoding every frame"
+            )
+            return
+
+        fourcc = int(self.cp.get(cv2.CAP_PROP_FOURCC))
+        codec = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4))
+        frame_range = None
+        if self._start > 0 or self._end is not None:
+            frame_range = (self._start, self._end)
+
+        self.frame_cache = DecodedFrameCache.for_source(
+            self.video_src,
+            self.width,
+            self.height,
+            codec,
+            self.cache_dir,
+            frame_range=frame_range,
+            stride=self.stride,
+        )
+        self.cached_frames = self.frame_cache.load()
+        self._cache_index = 0
+
+        if self.cached_frames is not None:
+            self.logger.info(
+                f"{self}: playing {len(self.cached_frames)} cached frames"
+            )
+            self.frame_cache = None
+            if self.save_name is not None:
+                self.logger.warning(
+                    f"{self}: frames replayed from the cache are not saved"
                 )
+
+    def _commit_frame_cache(self) -> None:
+        """Store the pass that just ended, and replay it if looping."""
+        if self.frame_cache is None:
+            return
+
+        frames = self.frame_cache.finish()
+        self.frame_cache = None
+        if frames is not None and self.loop:
+            self.cached_frames = frames
+            self._cache_index = 0
+
+    def _read_cached_frame(
+        self,
+    ) -> Optional[Tuple[np.ndarray, Optional[np.ndarray]]]:
+        if self._cache_index >= len(self.cached_frames):
+            if not self.loop:
+                return None
+            self._cache_index = 0
+
+        frame = self.cached_frames[self._cache_index]
+        self._cache_index += 1
+
+        # The cache only holds the resized frames, which are not saved
+        return frame, None
+
+    def _resolve_range(self) -> Tuple[int, Optional[int]]:
+        """The (start, end) frames to play, end being exclusive."""
+        if (
+            self.start_time is None
+            and self.end_time is None
+            and self.start_frame is None
+        ):
+            return 0, None
+
+        if isinstance(self.video_src, str) and not self.video_src.startswith(
+            "http"
+        ):
+            self.seek_index = SeekIndex.for_file(self.video_src)
+            if self.seek_index is None:
+                self.logger.warning(
+                    f"{self}: install PyAV (av) for fast, frame-accurate "
+                    "seeking, falling back to the OpenCV backend"
+                )
+
+        if self.seek_index is not None:
+            to_frame = self.seek_index.frame_at
         else:
-            if self.save_name is not None:
-                self.save_video(self.save_name, frame, self.frame_rate)
+            fps = self.cp.get(cv2.CAP_PROP_FPS) or self.frame_rate
+
+            def to_frame(t: float) -> int:
+                return int(round(t * fps))
+
+        if self.start_frame is not None:
+            start = self.start_frame
+        elif self.start_time is not None:
+            start = to_frame(self.start_time)
+        else:
+            start = 0
+
+        end = to_frame(self.end_time) if self.end_time is not None else None
+        return start, end
+
+    def _resolve_stride(self) -> int:
+        """The number of source frames advanced per emitted frame."""
+        if self.decimate is not None:
+            return max(1, int(self.decimate))
+
+        if self.target_fps is not None:
+            source_fps = self.cp.get(cv2.CAP_PROP_FPS) or self.frame_rate
+            return max(1, int(round(source_fps / self.target_fps)))
+
+        return 1
+
+    def _seek(self, frame: int) -> None:
+        """Position the video source so that ``frame`` is read next."""
+        if self.seek_index is None:
+            self.cp.set(cv2.CAP_PROP_POS_FRAMES, frame)
+        else:
+            keyframe = self.seek_index.keyframe_before(frame)
+            self.cp.set(cv2.CAP_PROP_POS_FRAMES, keyframe)
+            for _ in range(frame - keyframe):
+                self.cp.grab()
+
+        self._position = frame
+
+    def _rewind(self) -> None:
+        """Restart the video source from the start frame."""
+        if isinstance(self.video_src, str) and self.video_src.startswith(
+            "http"
+        ):
+            self.cp.release()
+            self.cp = cv2.VideoCapture(self.video_src)
+            self._position = 0
+            if self._start > 0:
+                self._seek(self._start)
+        else:
+            self._seek(self._start)
+
+    def _capture(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Read the next frame, into a pooled buffer if pooling is enabled."""
+        if self._end is not None and self._position >= self._end:
+            return False, None
+
+        if self.capture_pool is None or self._capture_shape is None:
+            ret, frame = self.cp.read()
+        else:
+            buffer = self.capture_pool.acquire(self._capture_shape)
+            ret, frame = self.cp.read(buffer)
+
+        if not ret:
+            return ret, frame
+
+        self._position += 1
+        if self.capture_pool is not None:
+            self._capture_shape = frame.shape
+
+        # Advance past the decimated frames without decoding them to images,
+        # so that frame_count is the source index of the emitted frame
+        for _ in range(self.stride - 1):
+            if self._end is not None and self._position >= self._end:
+                break
+            if not self.cp.grab():
+                break
+            self._position += 1
+
+        return ret, frame
+
+    def _resize(self, frame: np.ndarray) -> np.ndarray:
+        if self.output_pool is None:
+            return imutils.resize(frame, width=self.width, height=self.height)
+
+        w, h = resize_dims(frame.shape, self.width, self.height)
+        dst = self.output_pool.acquire((h, w) + frame.shape[2:])
+        return cv2.resize(frame, (w, h), dst=dst, interpolation=cv2.INTER_AREA)
+
+    def _read_frame(self) -> Optional[Tuple[np.ndarray, Optional[np.ndarray]]]:
+        """Read and resize the next frame, looping if requested.
+
+        Returns the resized frame and, if saving is enabled, the original
+        frame (None when playing from the frame cache). Returns None when no
+        frame could be read.
+        """
+        if self.cached_frames is not None:
+            return self._read_cached_frame()
+
+        ret, frame = self._capture()
+
+        if not ret:
+            self._commit_frame_cache()
+            if self.cached_frames is not None:
+                return self._read_cached_frame()
+
+        if not ret and self.loop:
+            self.logger.info("Restarting video")
+            self._rewind()
+            ret, frame = self._capture()
+
+        if not ret:
+            return None
+
+        raw = frame if self.save_name is not None else None
 
         if self.width or self.height:
-            frame = imutils.resize(frame, width=self.width, height=self.height)
+            frame = self._resize(frame)
+
+        if self.frame_cache is not None and not self.frame_cache.append(frame):
+            self.logger.warning(
+                f"{self}: frame size changed, not caching decoded frames"
+            )
+            self.frame_cache = None
+
+        return frame, raw
+
+    def _error_frame(self) -> np.ndarray:
+        if self._read_error_frame is None:
+            h = self.height or 480
+            w = self.width or 640
+            frame = np.zeros((h, w, 3), dtype=np.uint8)
+            cv2.putText(
+                frame,
+                "Read Error",
+                (h // 2, w // 2),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                1,
+                (0, 0, 255),
+                2,
+            )
+            self._read_error_frame = frame
+        return self._read_error_frame
+
+    def step(self) -> cpe.DataChunk:
+        data_chunk = cpe.DataChunk()
+
+        if self.prefetcher is not None:
+            item = self.prefetcher.get()
+        else:
+            item = self._read_frame()
+
+        timestamp = time.time()
+        ret = item is not None
+        if ret:
+            frame, raw = item
+            if self.video_writer is not None and raw is not None:
+                self.video_writer.submit(
+                    self.save_name,
+                    raw,
+                    self.frame_rate / self.stride,
+                    timestamp,
+                )
+        else:
+            self.logger.error("Could not read frame from video source")
+            frame = self._error_frame()
 
         if self.debug:
             cv2.imshow(
@@ -143,38 +508,84 @@ class Video(cpe.Node):
                     "source_name": self.name,
                     "frame_rate": self.frame_rate,
                     "frame_count": self.frame_count,
+                    "frame_stride": self.stride,
+                    "timestamp": timestamp,
                     "belongs_to_video_src": bool(ret),
+                    "late_frames": self.clock.late,
+                    "skipped_ticks": self.clock.dropped,
                 },
             )
 
         # Sleeping
-        if self.frame_count == 0:
-            self.initial = datetime.datetime.now()
-        else:
-            current_datetime = datetime.datetime.now()
-            delta = (current_datetime - self.initial).total_seconds()
-            expected = self.frame_count / self.frame_rate
-            sleep_time = expected - delta
-            time.sleep(max(self.sleep_factor * sleep_time, 0))
+        self.clock.wait()
 
         # Update
-        self.frame_count += 1
+        self.frame_count += self.stride
 
         return data_chunk
 
+    def step_batch(
+        self, batch_size: int, batch_timeout_ms: Optional[float] = None
+    ) -> List[cpe.DataChunk]:
+        """Run up to ``batch_size`` Video steps and return their data chunks.
+
+        Used by subclasses that emit lists of frames. The batch is cut short
+        once ``batch_timeout_ms`` have elapsed since its first frame, or when
+        the video source stops producing frames.
+        """
+        chunks = []
+        start = time.monotonic()
+        while len(chunks) < batch_size:
+            data_chunk = Video.step(self)
+            chunks.append(data_chunk)
+
+            if self.include_meta:
+                meta = data_chunk.get("metadata")["value"]
+                if not meta["belongs_to_video_src"]:
+                    break
+
+            if batch_timeout_ms is not None:
+                elapsed = (time.monotonic() - start) * 1000
+                if elapsed >= batch_timeout_ms:
+                    break
+
+        return chunks
+
     def teardown(self) -> None:
-        self.cp.release()
+        if self.prefetcher is not None:
+            self.prefetcher.stop()
+            self.prefetcher = None
+
+        if self.video_writer is not None:
+            self.video_writer.close()
+            self.logger.info(
+                f"{self}: video writer stats {self.video_writer.stats()}"
+            )
+
+        if self.frame_cache is not None:
+            # The pass was not complete
+            self.frame_cache.abort()
+            self.frame_cache = None
+
+        if self.clock is not None:
+            self.logger.info(f"{self}: pacing stats {self.clock.stats()}")
+        if self.output_pool is not None:
+            self.logger.info(
+                f"{self}: buffer pool stats "
+                f"capture={self.capture_pool.stats()}, "
+                f"output={self.output_pool.stats()}"
+            )
+
+        if self.cp is not None:
+            self.cp.release()
         if self.debug:
             cv2.destroyAllWindows()
 
     @staticmethod
-    def download_video_from_url(url):
-        dirname = tempfile.mkdtemp()
-        filename = os.path.join(dirname, "video.mp4")
-        fname = download_file(
-            url, filename, chunk_size=1024, desc="Downloading video"
+    def download_video_from_url(url: str, sha256: Optional[str] = None) -> str:
+        return str(
+            cached_download(url, sha256=sha256, desc="Downloading video")
         )
-        return fname
 
 
 @sink_node(name="CPPipelines_ShowWindows")
@@ -191,8 +602,24 @@ class ShowWindows(cpe.Node):
         The x, y coordinates of the first window. Use this to position the window(s)
     items_per_row: int, optional (default: 2)
         The number of rows of windows to show. This is used to position the windows
+    mosaic: bool, optional (default: False)
+        If True, compose all sources into a single window, on a grid of
+        items_per_row tiles per row, instead of one window per source
+    tile_size: Tuple[int, int], optional (default: None)
+        The (width, height) of a mosaic tile. Defaults to the size of the first
+        frame received
+    max_refresh_rate: float, optional (default: 30)
+        The maximum rate, in frames per second, at which the mosaic is redrawn
     **kwargs
         Additional keyword arguments to pass to the Node constructor
+
+    Notes
+    -----
+        In mosaic mode, step only stores the latest frame of each source. A
+        display thread composes the latest frames into one preallocated canvas
+        and shows it with a single ``imshow``/``waitKey``, so a slow display
+        never applies back-pressure to the pipeline. All the OpenCV window
+        calls are made from that thread.
     """
 
     def __init__(
@@ -201,14 +628,52 @@ class ShowWindows(cpe.Node):
         frames_key: str = "frame",
         items_per_row: int = 2,
         window_xy: Optional[Tuple[int, int]] = None,
+        mosaic: bool = False,
+        tile_size: Optional[Tuple[int, int]] = None,
+        max_refresh_rate: float = 30,
         **kwargs,
     ) -> None:
         self.frames_key = frames_key
         self.window_xy = np.array(window_xy, dtype=int) if window_xy else None
         self.items_per_row = items_per_row
+        self.mosaic = mosaic
+        self.tile_size = tuple(tile_size) if tile_size else None
+        self.max_refresh_rate = max_refresh_rate
+
+        self.canvas: Optional[np.ndarray] = None
+        self._tiles: Dict[str, int] = {}
+        self._latest: Dict[str, np.ndarray] = {}
+        self._latest_lock = threading.Lock()
+        self._new_frames = threading.Event()
+        self._running = threading.Event()
+        self._display_thread: Optional[threading.Thread] = None
         super().__init__(name=name, **kwargs)
 
+    def setup(self) -> None:
+        if self.mosaic:
+            self._running.set()
+            self._display_thread = threading.Thread(
+                target=self._display_loop,
+                name=f"{self.name}-display",
+                daemon=True,
+            )
+            self._display_thread.start()
+
     def step(self, data_chunks: Dict[str, cpe.DataChunk]) -> None:
+        if self.mosaic:
+            with self._latest_lock:
+                for name, data_chunk in data_chunks.items():
+                    maybe_metadata = data_chunk.get("metadata")
+                    window_id = self._get_window_id(
+                        name,
+                        maybe_metadata["value"] if maybe_metadata else None,
+                    )
+                    self._latest[window_id] = data_chunk.get(self.frames_key)[
+                        "value"
+                    ]
+            self._new_frames.set()
+            return
+
         max_f_height = 0
         prev_position = None
         for idx, (name, data_chunk) in enumerate(data_chunks.items()):
@@ -250,5 +715,67 @@ class ShowWindows(cpe.Node):
 
         return window_id
 
-    def teardown(self) -> None:
+    def _display_loop(self) -> None:
+        clock = PacingClock(self.max_refresh_rate)
+        while self._running.is_set():
+            if not self._new_frames.wait(timeout=0.1):
+                continue
+            self._new_frames.clear()
+
+            with self._latest_lock:
+                latest, self._latest = self._latest, {}
+            if not latest:
+                continue
+
+            for window_id, frame in latest.items():
+                self._draw_tile(window_id, frame)
+
+            cv2.imshow(self.name, self.canvas)
+            if self.window_xy is not None:
+                cv2.moveWindow(self.name, *map(int, self.window_xy))
+            cv2.waitKey(1)
+            clock.wait()
+
         cv2.destroyAllWindows()
+
+    def _draw_tile(self, window_id: str, frame: np.ndarray) -> None:
+        """Draw a frame into its tile of the mosaic canvas."""
+        if self.tile_size is None:
+            self.tile_size = (frame.shape[1], frame.shape[0])
+        tile_w, tile_h = self.tile_size
+
+        if window_id not in self._tiles:
+            self._tiles[window_id] = len(self._tiles)
+            cols = min(len(self._tiles), self.items_per_row)
+            rows = -(-len(self._tiles) // self.items_per_row)
+            shape = (rows * tile_h, cols * tile_w, 3)
+            if self.canvas is None or self.canvas.shape != shape:
+                # Only reallocated when a new source adds a row or column
+                canvas = np.zeros(shape, dtype=np.uint8)
+                if self.canvas is not None:
+                    h, w = self.canvas.shape[:2]
+                    canvas[:h, :w] = self.canvas
+                self.canvas = canvas
+
+        row, col = divmod(self._tiles[window_id], self.items_per_row)
+        tile = self.canvas[
+            row * tile_h : (row + 1) * tile_h, col * tile_w : (col + 1) * tile_w
+        ]
+
+        if frame.ndim == 2:
+            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+        elif frame.shape[2] == 4:
+            frame = frame[..., :3]
+
+        if frame.shape[:2] == (tile_h, tile_w):
+            tile[...] = frame
+        else:
+            cv2.resize(frame, (tile_w, tile_h), dst=tile)
+
+    def teardown(self) -> None:
+        if self._display_thread is not None:
+            self._running.clear()
+            self._display_thread.join()
+            self._display_thread = None
+        else:
+            cv2.destroyAllWindows()
@@ -0,0 +1,302 @@
+import logging
+import pathlib
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from .recording import on_recording_stopped
+
+if TYPE_CHECKING:
+    import chimerapy.engine as cpe
+
+_CLOSE = object()
+
+
+class _VideoStream:
+    """One output file, opened once its frame rate is known.
+
+    Like the engine's ``VideoRecord``, frames are written at their position in
+    time rather than in arrival order: a frame that arrives late is preceded by
+    copies of the previous frame, and a frame that arrives early is skipped, so
+    the video stays aligned with the wall clock.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        fourcc: str,
+        fps: Optional[float],
+        probe_frames: int,
+    ) -> None:
+        self.path = path
+        self.fourcc = fourcc
+        self.fps = fps
+        self.probe_frames = probe_frames
+        self.writer: Optional[cv2.VideoWriter] = None
+        self.pending: List[Tuple[np.ndarray, float]] = []
+        self.start: Optional[float] = None
+        self.last: Optional[np.ndarray] = None
+        self.written = 0
+        self.padded = 0
+        self.skipped = 0
+
+    def write(self, frame: np.ndarray, timestamp: float) -> None:
+        if self.writer is None:
+            self.pending.append((frame, timestamp))
+            if self.fps is None and len(self.pending) < self.probe_frames:
+                return
+            self._open()
+            return
+
+        if self.start is None:
+            self.start = timestamp
+
+        # Index of the frame slot the timestamp falls into
+        index = int((timestamp - self.start) * self.fps + 0.5)
+        if index < self.written:
+            self.skipped += 1
+            return
+
+        while self.last is not None and self.written < index:
+            self.writer.write(self.last)
+            self.written += 1
+            self.padded += 1
+
+        self.writer.write(frame)
+        self.written += 1
+        self.last = frame
+
+    def close(self) -> None:
+        if self.writer is None and self.pending:
+            self._open()
+
+        if self.writer is not None:
+            self.writer.release()
+            self.writer = None
+
+    def _open(self) -> None:
+        if self.fps is None:
+            self.fps = self._estimate_fps()
+
+        h, w = self.pending[0][0].shape[:2]
+        is_color = self.pending[0][0].ndim == 3
+        self.writer = cv2.VideoWriter(
+            str(self.path),
+            cv2.VideoWriter_fourcc(*self.fourcc),
+            self.fps,
+            (w, h),
+            is_color,
+        )
+
+        pending, self.pending = self.pending, []
+        for frame, timestamp in pending:
+            self.write(frame, timestamp)
+
+    def _estimate_fps(self) -> float:
+        """The arrival rate of the probed frames, or 30 if unknown."""
+        if len(self.pending) < 2:
+            return 30.0
+
+        elapsed = self.pending[-1][1] - self.pending[0][1]
+        if elapsed <= 0:
+            return 30.0
+
+        return (len(self.pending) - 1) / elapsed
+
+
+class AsyncVideoWriter:
+    """Encodes video files on a background thread, fed by a bounded queue.
+
+    Frames are copied on ``submit`` and encoded by a dedicated thread, so disk
+    or encoder stalls never block the caller. When the queue is full the
+    submitted frame is dropped with a warning instead of blocking; the gap is
+    filled with the previous frame, so the video stays in sync.
+
+    The files are only complete once ``close`` has returned. Writers created
+    with ``for_node`` are closed when the node stops, before the engine
+    collects its log directory.
+
+    Parameters
+    ----------
+    directory : pathlib.Path
+        The directory the video files (``<name>.mp4``) are written to
+    queue_size : int, optional (default: 64)
+        The maximum number of frames waiting to be encoded
+    enabled : Callable[[], bool], optional (default: always enabled)
+        Frames are only accepted while this returns True
+    probe_frames : int, optional (default: 30)
+        For streams submitted without a frame rate, the number of frames used
+        to measure the actual arrival rate before the file is opened
+    fourcc : str, optional (default: "mp4v")
+        The codec used to encode the video files
+    logger : logging.Logger, optional
+        The logger used to report encoder errors
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, pathlib.Path],
+        queue_size: int = 64,
+        enabled: Callable[[], bool] = lambda: True,
+        probe_frames: int = 30,
+        fourcc: str = "mp4v",
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.directory = pathlib.Path(directory)
+        self.queue_size = queue_size
+        self.enabled = enabled
+        self.probe_frames = probe_frames
+        self.fourcc = fourcc
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.submitted = 0
+        self.dropped = 0
+        self.closed = False
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._streams: Dict[str, _VideoStream] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def for_node(
+        cls, node: "cpe.Node", **kwargs
+    ) -> Optional["AsyncVideoWriter"]:
+        """A writer saving into the node's log directory while it records.
+
+        The writer is closed when the node stops, so its videos are complete
+        when the node's data is collected. Returns None, with a warning, if
+        the node has no log directory (it is not run by a worker).
+        """
+        if node.state.logdir is None:
+            node.logger.warning(
+                f"{node}: no log directory, videos will not be saved"
+            )
+            return None
+
+        writer = cls(
+            directory=node.state.logdir,
+            enabled=lambda: node.recorder is not None and node.recorder.enabled,
+            logger=node.logger,
+            **kwargs,
+        )
+        on_recording_stopped(node, writer.close)
+        return writer
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def written(self) -> int:
+        return sum(stream.written for stream in self._streams.values())
+
+    @property
+    def padded(self) -> int:
+        return sum(stream.padded for stream in self._streams.values())
+
+    def submit(
+        self,
+        name: str,
+        frame: np.ndarray,
+        fps: Optional[float] = None,
+        timestamp: Optional[float] = None,
+    ) -> bool:
+        """Queue a frame for the ``name`` video.
+
+        Parameters
+        ----------
+        name : str
+            The name of the video file, without extension
+        frame : np.ndarray
+            The frame to write
+        fps : float, optional
+            The frame rate of the stream. If None, it is measured from the
+            arrival rate of the first frames
+        timestamp : float, optional
+            The wall-clock time (``time.time()``) the frame was captured at,
+            e.g. the ``timestamp`` metadata of Video. Frames are placed in the
+            video by this time, so it must be given when frames are submitted
+            in batches. Defaults to the time of the call
+
+        Returns
+        -------
+        bool
+            Whether the frame was queued
+        """
+        if self.closed or not self.enabled():
+            return False
+
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name=f"AsyncVideoWriter-{name}", daemon=True
+            )
+            self._thread.start()
+
+        if timestamp is None:
+            timestamp = time.time()
+        entry = (name, np.array(frame, dtype=np.uint8), fps, timestamp)
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 100 == 0:
+                self.logger.warning(
+                    f"Video writer queue is full, {self.dropped} frame(s) "
+                    "dropped so far"
+                )
+            return False
+
+        self.submitted += 1
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush the queued frames and close all video files.
+
+        Later submissions are ignored. Closing again does nothing.
+        """
+        self.closed = True
+        if self._thread is None:
+            return
+
+        self._queue.put(_CLOSE)
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queue_depth": self.queue_depth,
+            "submitted": self.submitted,
+            "written": self.written,
+            "padded": self.padded,
+            "dropped": self.dropped,
+        }
+
+    def _run(self) -> None:
+        while True:
+            entry = self._queue.get()
+            if entry is _CLOSE:
+                break
+
+            name, frame, fps, timestamp = entry
+            try:
+                self._get_stream(name, fps).write(frame, timestamp)
+            except Exception as e:
+                self.logger.error(f"Failed to write video {name}: {e}")
+
+        for stream in self._streams.values():
+            stream.close()
+
+    def _get_stream(self, name: str, fps: Optional[float]) -> _VideoStream:
+        if name not in self._streams:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._streams[name] = _VideoStream(
+                self.directory / f"{name}.mp4",
+                self.fourcc,
+                fps,
+                self.probe_frames,
+            )
+        return self._streams[name]
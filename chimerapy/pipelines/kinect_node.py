@@ -1,11 +1,11 @@
 import pathlib
-import time
-from typing import Literal
+from typing import Literal, Optional
 
 import cv2
 import imutils
 
 import chimerapy.engine as cpe
+from chimerapy.pipelines.generic_nodes.pacing import PacingClock
 
 
 class KinectNode(cpe.Node):
@@ -14,10 +14,15 @@ class KinectNode(cpe.Node):
         name: str,
         kinect_data_folder: pathlib.Path,
         show: bool = False,
+        fps: float = 30,
+        playback_speed: float = 1.0,
         debug: Literal["step", "stream"] = None,
     ):
         self.kinect_data_folder = kinect_data_folder
         self.show = show
+        self.fps = fps
+        self.playback_speed = playback_speed
+        self.clock: Optional[PacingClock] = None
 
         super().__init__(name=name, debug=debug)
 
@@ -28,9 +33,10 @@ class KinectNode(cpe.Node):
         self.depth_cap = cv2.VideoCapture(
             str(self.kinect_data_folder / "DepthStream.mp4")
         )
+        self.clock = PacingClock(self.fps, speed=self.playback_speed)
 
     def step(self) -> cpe.DataChunk:
-        time.sleep(1 / 30)
+        self.clock.wait()
 
         # Read data
         ret, frame = self.color_cap.read()
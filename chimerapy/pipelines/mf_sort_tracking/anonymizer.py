@@ -13,6 +13,7 @@ if TYPE_CHECKING:
     from .data import MFSortFrame
 
 from chimerapy.orchestrator import step_node
+from chimerapy.pipelines.model_store import ModelStore
 
 
 @step_node(name="CPPipelines_Anonymizer")
@@ -22,7 +23,9 @@ class Anonymizer(cpe.Node):
     Parameters
     ----------
     model_name : str, optional, default="yolov8m-seg"
-        The name of the YOLO model to use
+        The name of the YOLO model to use, or a local path to its weights.
+        The weights are installed once in the model store and then loaded
+        without network access
     frames_key : str, optional, default="frame"
         The key of the frames in the data chunk, by default "frame"
     device : Literal["cpu", "cuda"], optional, default="cpu"
@@ -33,6 +36,8 @@ class Anonymizer(cpe.Node):
         The alpha value for the overlay
     name : str, optional, default="Anonymizer"
         The name of the node
+    weights_sha256 : str, optional, default=None
+        The expected sha256 of the weights
     """
 
     def __init__(
@@ -43,8 +48,10 @@ class Anonymizer(cpe.Node):
         show: bool = False,
         alpha: float = 0.5,
         name: str = "Anonymizer",
+        weights_sha256: Optional[str] = None,
     ):
         self.model_name = model_name
+        self.weights_sha256 = weights_sha256
         self.frames_key = frames_key
         self.device = device
         self.model: Optional[YOLO] = None
@@ -64,7 +71,9 @@ class Anonymizer(cpe.Node):
         from ultralytics.yolo.data.augment import LetterBox
         from ultralytics.yolo.utils.plotting import Annotator, colors
 
-        self.model = YOLO(self.model_name)
+        store = ModelStore(logger=self.logger)
+        weights = store.weights(self.model_name, sha256=self.weights_sha256)
+        self.model = store.load(self.model_name, lambda: YOLO(str(weights)))
         self.model.to(self.device)
 
         self.Annotator = Annotator
@@ -78,7 +87,8 @@ class Anonymizer(cpe.Node):
         for _, data_chunk in data_chunks.items():
             frames: List[MFSortFrame] = data_chunk.get(self.frames_key)["value"]
             for frame in frames:
-                collected_frames.append(frame)
+                # The masks are drawn in place, shared frames are copied first
+                collected_frames.append(frame.writable())
 
         arrays = [frame.arr for frame in collected_frames]
         results = self.model.predict(
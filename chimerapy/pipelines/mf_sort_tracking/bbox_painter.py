@@ -1,3 +1,4 @@
+import dataclasses
 from typing import Dict, List, Optional, Tuple
 
 import cv2
@@ -5,12 +6,43 @@ import numpy as np
 
 import chimerapy.engine as cpe
 from chimerapy.orchestrator import step_node
-from chimerapy.pipelines.mf_sort_tracking.data import MFSortFrame
+from chimerapy.pipelines.generic_nodes.video_writer import AsyncVideoWriter
+from chimerapy.pipelines.mf_sort_tracking.data import (
+    DetectionArray,
+    MFSortFrame,
+)
 
 
 @step_node(name="CPPipelines_BBoxPainter")
 class BBoxPainter(cpe.Node):
-    """A node that paints bounding boxes on a frame."""
+    """A node that paints bounding boxes on a frame.
+
+    Parameters
+    ----------
+    frames_key: str, optional (default: "frame")
+        The key to use for the frames in the data chunk
+    draw_boxes: bool, optional (default: True)
+        Whether to draw the tracked bounding boxes
+    show: bool, optional (default: False)
+        Whether to show the painted frames
+    video_title_prefix: str, optional (default: None)
+        If provided, save the painted frames of each source as a video
+        named ``<video_title_prefix>_<src_id>``
+    fps: float, optional (default: None)
+        The frame rate of the saved videos. If None, it is measured from the
+        rate at which frames arrive
+    name: str, optional (default: "BBoxPainter")
+        The name of the node
+    paint_classes: List[int], optional (default: None)
+        The classes whose bounding boxes are filled in
+    copy_frames: bool, optional (default: None)
+        If True, paint a copy of each frame instead of the received pixels.
+        If None, frames in shared memory are copied and other frames are
+        painted in place. Read-only frames are always painted on a copy, so
+        that other consumers of the ring are not affected
+    **kwargs
+        Additional keyword arguments to pass to the Node constructor
+    """
 
     def __init__(
         self,
@@ -18,17 +50,26 @@ class BBoxPainter(cpe.Node):
         draw_boxes: bool = True,
         show: bool = False,
         video_title_prefix: Optional[str] = None,
+        fps: Optional[float] = None,
         name: str = "BBoxPainter",
         paint_classes: Optional[List[int]] = None,
+        copy_frames: Optional[bool] = None,
         **kwargs,
     ) -> None:
         self.frames_key = frames_key
         self.draw_boxes = draw_boxes
         self.show = show
         self.video_title_prefix = video_title_prefix
+        self.fps = fps
         self.paint_classes = paint_classes
+        self.copy_frames = copy_frames
+        self.video_writer: Optional[AsyncVideoWriter] = None
         super().__init__(name=name, **kwargs)
 
+    def setup(self) -> None:
+        if self.video_title_prefix is not None:
+            self.video_writer = AsyncVideoWriter.for_node(self)
+
     @staticmethod
     def bbox_plot(
         img: np.ndarray,
@@ -42,12 +83,9 @@ class BBoxPainter(cpe.Node):
         cv2.rectangle(img, (t, l), ((t + w), (l + h)), color, thickness)
 
     def _paint_classes(self, frame: MFSortFrame):
-        for bbox in frame.all_boxes:
-            if bbox.cls in self.paint_classes:
-                t, l, w, h = bbox.tlwh.astype(int)  # noqa: E741
-                self.bbox_plot(
-                    frame.arr, t, l, w, h, color=(0, 255, 0), thickness=-1
-                )
+        boxes = frame.all_boxes.with_classes(self.paint_classes)
+        if len(boxes):
+            cv2.fillPoly(frame.arr, _corners(boxes.tlwh), (0, 255, 0))
 
     @staticmethod
     def _put_text(img, t, l, text, color) -> None:  # noqa: E741
@@ -62,39 +100,91 @@ class BBoxPainter(cpe.Node):
                 2,
             )
 
+    def paint(self, frame: MFSortFrame) -> None:
+        """Draw the tracked boxes, labels and filled classes of a frame."""
+        img = frame.arr
+        tracks = [det for det in frame.detections if len(det.bboxes)]
+
+        if self.draw_boxes and tracks:
+            boxes = DetectionArray.concat([det.bboxes for det in tracks])
+            corners = iter(_corners(boxes.tlwh))
+            # polylines draws in a single color, so draw once per color
+            by_color: Dict[Tuple[int, int, int], List[np.ndarray]] = {}
+            for det in tracks:
+                polygons = by_color.setdefault(tuple(det.color), [])
+                polygons.extend(next(corners) for _ in range(len(det.bboxes)))
+            for color, polygons in by_color.items():
+                cv2.polylines(img, polygons, True, color, 2)
+
+        for det in tracks:
+            text = det.get_text()
+            if text is None:
+                continue
+            top_left = det.bboxes.tlwh[:, :2].astype(int).tolist()
+            for t, l in top_left:  # noqa: E741
+                self._put_text(img, t, l, text, det.color)
+
+        if self.paint_classes is not None:
+            self._paint_classes(frame)
+
+    def paint_frames(self, frames: List[MFSortFrame]) -> List[MFSortFrame]:
+        """Paint frames, or copies of them (see ``copy_frames``)."""
+        painted = []
+        for frame in frames:
+            copy = self.copy_frames
+            if copy is None:
+                copy = frame.handle is not None
+            if copy:
+                frame = dataclasses.replace(
+                    frame, arr=frame.arr.copy(), handle=None
+                )
+            else:
+                frame = frame.writable()
+            self.paint(frame)
+            painted.append(frame)
+        return painted
+
     def step(self, data_chunks: Dict[str, cpe.DataChunk]) -> cpe.DataChunk:
         ret_chunk = cpe.DataChunk()
         collected_frames = []
         for name, data_chunk in data_chunks.items():  # noqa: B007
             frames: List[MFSortFrame] = data_chunk.get(self.frames_key)["value"]
-            for frame in frames:
-                img = frame.arr
-                for det in frame.detections:
-                    for bbox in det.bboxes:
-                        t, l, w, h = bbox.tlwh.astype(int)  # noqa: E741
-
-                        if self.draw_boxes:
-                            self.bbox_plot(img, t, l, w, h, color=det.color)
-
-                        self._put_text(img, t, l, det.get_text(), det.color)
-
-                    if self.paint_classes is not None:
-                        self._paint_classes(frame)
-
-                collected_frames.append(frame)
+            collected_frames.extend(self.paint_frames(frames))
 
         for frame in collected_frames:
             if self.show:
                 cv2.imshow(frame.src_id, frame.arr)
                 cv2.waitKey(1)
 
-            if self.video_title_prefix is not None:
-                self.save_video(
-                    name=f"{self.video_title_prefix}_{frame.src_id}",
-                    data=frame.arr,
-                    fps=30,
+            if self.video_writer is not None:
+                self.video_writer.submit(
+                    f"{self.video_title_prefix}_{frame.src_id}",
+                    frame.arr,
+                    self.fps,
+                    frame.timestamp,
                 )
 
         ret_chunk.add(self.frames_key, collected_frames)
 
         return ret_chunk
+
+    def teardown(self) -> None:
+        if self.video_writer is not None:
+            self.video_writer.close()
+            self.logger.info(
+                f"{self}: video writer stats {self.video_writer.stats()}"
+            )
+
+
+def _corners(tlwh: np.ndarray) -> np.ndarray:
+    """The (N, 4, 2) integer corners of (N, 4) tlwh boxes, for cv2 polygons."""
+    t, l, w, h = tlwh.astype(np.int32).T  # noqa: E741
+    return np.stack(
+        [
+            np.stack([t, l], axis=1),
+            np.stack([t + w, l], axis=1),
+            np.stack([t + w, l + h], axis=1),
+            np.stack([t, l + h], axis=1),
+        ],
+        axis=1,
+    )
@@ -1,24 +1,180 @@
+import dataclasses
 import typing
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Type
 
 if typing.TYPE_CHECKING:
     from mf_sort.detection import Detection
 
+    from chimerapy.pipelines.generic_nodes.shared_frames import (
+        SharedFrameHandle,
+    )
+
 import numpy as np
 
 
+class DetectionArray:
+    """The bounding boxes of a frame, stored as columns.
+
+    ``tlwh`` is a (N, 4) array of boxes, ``confidence``, ``cls`` and
+    ``track_id`` are (N,) arrays (``track_id`` is -1 for untracked boxes).
+    Indexing with a boolean mask, an index array or a slice returns a new
+    DetectionArray, so that filtering is a single vectorized operation.
+    Iterating, or indexing with an int, yields DetectionView rows that read
+    like ``mf_sort.Detection`` objects.
+    """
+
+    __slots__ = ("tlwh", "confidence", "cls", "track_id")
+
+    def __init__(
+        self,
+        tlwh: Optional[np.ndarray] = None,
+        confidence: Optional[np.ndarray] = None,
+        cls: Optional[np.ndarray] = None,
+        track_id: Optional[np.ndarray] = None,
+    ) -> None:
+        self.tlwh = np.asarray(
+            tlwh if tlwh is not None else [], dtype=np.float32
+        ).reshape(-1, 4)
+        n = len(self.tlwh)
+        self.confidence = _column(confidence, n, np.float32, 1.0)
+        self.cls = _column(cls, n, np.int32, 0)
+        self.track_id = _column(track_id, n, np.int32, -1)
+
+    @classmethod
+    def from_detections(
+        cls, detections: Iterable["Detection"], track_id: int = -1
+    ) -> "DetectionArray":
+        """Convert ``mf_sort.Detection`` objects (or DetectionViews)."""
+        if isinstance(detections, DetectionArray):
+            return detections
+
+        detections = list(detections)
+        return cls(
+            [det.tlwh for det in detections],
+            [det.confidence for det in detections],
+            [det.cls for det in detections],
+            np.full(len(detections), track_id),
+        )
+
+    @classmethod
+    def concat(cls, arrays: Sequence["DetectionArray"]) -> "DetectionArray":
+        if len(arrays) == 1:
+            return arrays[0]
+        if not arrays:
+            return cls()
+
+        return cls(
+            np.concatenate([arr.tlwh for arr in arrays]),
+            np.concatenate([arr.confidence for arr in arrays]),
+            np.concatenate([arr.cls for arr in arrays]),
+            np.concatenate([arr.track_id for arr in arrays]),
+        )
+
+    def to_detections(
+        self, detection_cls: Type["Detection"]
+    ) -> List["Detection"]:
+        """Convert the boxes to ``mf_sort.Detection`` objects."""
+        return [
+            detection_cls(self.tlwh[i].copy(), self.confidence[i], self.cls[i])
+            for i in range(len(self))
+        ]
+
+    def with_classes(self, classes: Sequence[int]) -> "DetectionArray":
+        """The boxes whose class is in ``classes``."""
+        return self[np.isin(self.cls, classes)]
+
+    def __len__(self) -> int:
+        return len(self.tlwh)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            index = int(key) + len(self) if key < 0 else int(key)
+            if not 0 <= index < len(self):
+                raise IndexError(f"{key} out of range for {len(self)} boxes")
+            return DetectionView(self, index)
+
+        return DetectionArray(
+            self.tlwh[key],
+            self.confidence[key],
+            self.cls[key],
+            self.track_id[key],
+        )
+
+    def __iter__(self) -> Iterator["DetectionView"]:
+        return (DetectionView(self, i) for i in range(len(self)))
+
+    def __getstate__(self):
+        return (self.tlwh, self.confidence, self.cls, self.track_id)
+
+    def __setstate__(self, state):
+        self.tlwh, self.confidence, self.cls, self.track_id = state
+
+    def __repr__(self) -> str:
+        return f"<DetectionArray {len(self)} boxes>"
+
+
+class DetectionView:
+    """A row of a DetectionArray, exposing it like ``mf_sort.Detection``."""
+
+    __slots__ = ("_boxes", "_index")
+
+    def __init__(self, boxes: DetectionArray, index: int) -> None:
+        self._boxes = boxes
+        self._index = index
+
+    @property
+    def tlwh(self) -> np.ndarray:
+        return self._boxes.tlwh[self._index]
+
+    @property
+    def confidence(self) -> float:
+        return float(self._boxes.confidence[self._index])
+
+    @property
+    def cls(self) -> int:
+        return int(self._boxes.cls[self._index])
+
+    @property
+    def track_id(self) -> int:
+        return int(self._boxes.track_id[self._index])
+
+    def __repr__(self) -> str:
+        return f"<DetectionView {self.tlwh.tolist()} cls={self.cls}>"
+
+
+def _column(
+    values: Optional[Sequence], n: int, dtype: np.dtype, default
+) -> np.ndarray:
+    if values is None:
+        return np.full(n, default, dtype=dtype)
+    return np.asarray(values, dtype=dtype).reshape(n)
+
+
 @dataclass
 class MFSortTrackedDetections:
-    """Bounding Boxes for a frame from a video source."""
+    """Bounding Boxes for a frame from a video source.
+
+    ``bboxes`` is a DetectionArray, a list of detections is converted.
+    ``predicted`` is set when the boxes were extrapolated by the tracker on a
+    frame the detector skipped, rather than matched to detections.
+    """
 
     tracker_id: Optional[int] = None
     color: Tuple[int, int, int] = (0, 255, 0)
-    bboxes: List["Detection"] = field(default_factory=list)
+    bboxes: DetectionArray = field(default_factory=DetectionArray)
+    predicted: bool = False
+
+    def __post_init__(self):
+        if not isinstance(self.bboxes, DetectionArray):
+            self.bboxes = DetectionArray.from_detections(
+                self.bboxes, -1 if self.tracker_id is None else self.tracker_id
+            )
 
     def get_text(self) -> Optional[str]:
         if self.tracker_id is not None:
-            return f"Tracker: {self.tracker_id}"
+            suffix = " (predicted)" if self.predicted else ""
+            return f"Tracker: {self.tracker_id}{suffix}"
 
     def __repr__(self) -> str:
         return f"<MFSortDetections {self.tracker_id}>"
@@ -26,13 +182,51 @@ class MFSortTrackedDetections:
 
 @dataclass
 class MFSortFrame:
-    """A frame from a video source."""
+    """A frame from a video source.
+
+    If ``handle`` is set and ``arr`` is still the shared memory view it points
+    to, only the handle is pickled and the receiving node maps the pixels
+    back from shared memory instead of unpickling a copy. ``timestamp`` is the
+    wall-clock time the frame was captured at. ``detected`` is False for the
+    frames the detector skipped (see MFSortDetector's ``detect_every``).
+    ``all_boxes`` is a DetectionArray, a list of detections is converted.
+
+    Shared memory views are read-only, since every consumer of the ring sees
+    the same pixels; nodes that draw on frames use ``writable``.
+    """
 
     arr: np.ndarray
     frame_count: int
     src_id: str
     detections: List[MFSortTrackedDetections] = field(default_factory=list)
-    all_boxes: List["Detection"] = field(default_factory=list)
+    all_boxes: DetectionArray = field(default_factory=DetectionArray)
+    handle: Optional["SharedFrameHandle"] = None
+    timestamp: Optional[float] = None
+    detected: bool = True
+
+    def __post_init__(self):
+        if not isinstance(self.all_boxes, DetectionArray):
+            self.all_boxes = DetectionArray.from_detections(self.all_boxes)
+
+    def writable(self) -> "MFSortFrame":
+        """This frame if its pixels can be modified, otherwise a copy.
+
+        The copy owns its pixels and is no longer backed by shared memory.
+        """
+        if self.arr.flags.writeable:
+            return self
+        return dataclasses.replace(self, arr=self.arr.copy(), handle=None)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self.handle is not None and self.handle.maps(self.arr):
+            state["arr"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.arr is None and self.handle is not None:
+            self.arr = self.handle.open()
 
     def __repr__(self) -> str:
         return f"<Frame from {self.src_id} {self.frame_count}>"
@@ -1,6 +1,5 @@
-import tempfile
 import typing
-from typing import Dict, List, Literal, Optional
+from typing import Dict, List, Literal, Optional, Tuple
 
 if typing.TYPE_CHECKING:
     from mf_sort.detector import Detector
@@ -10,11 +9,13 @@ import numpy as np
 
 import chimerapy.engine as cpe
 from chimerapy.orchestrator import step_node
+from chimerapy.pipelines.generic_nodes.buffer_pool import FrameBufferPool
 from chimerapy.pipelines.mf_sort_tracking.data import (
+    DetectionArray,
     MFSortFrame,
     MFSortTrackedDetections,
 )
-from chimerapy.pipelines.utils import download_file
+from chimerapy.pipelines.utils import cached_download
 
 
 @step_node(name="CPPipelines_MFSortDetector")
@@ -24,7 +25,8 @@ class MFSortDetector(cpe.Node):
     Parameters
     ----------
     weights: str, required
-        Path or url to the weights file
+        Path or url to the weights file. Downloaded weights are kept in the
+        package cache
     imgsz: int, optional (default: 640)
         The size of the image to be used for detection
     device: Literal["cpu", "cuda"], optional (default: "cpu")
@@ -37,6 +39,24 @@ class MFSortDetector(cpe.Node):
         The name of the node
     frames_key: str, optional (default: "frame")
         The key to use for the frame in the data chunk
+    weights_sha256: str, optional (default: None)
+        The expected sha256 of downloaded weights
+    detect_every: int, optional (default: 1)
+        Run the detector on one frame out of ``detect_every`` of each source.
+        The other frames are passed on with ``detected=False`` and the tracker
+        predicts their boxes
+    redetect_conf_thresh: float, optional (default: None)
+        If provided, also run the detector on the next frame of a source
+        whenever the mean confidence of its last detections is below this
+        threshold, so that uncertain scenes are detected on every frame
+    max_batch_size: int, optional (default: 16)
+        The maximum number of frames passed to the detector at once. The
+        frames of all inputs are predicted together, in batches of at most
+        this size
+    letterbox: bool, optional (default: False)
+        If True, pad the frames of a batch at the bottom and right to the
+        largest frame of the batch, so that sources of mixed resolutions are
+        predicted as one batch. Boxes are clipped back to their frame
     **kwargs
         Additional keyword arguments to pass to the Node constructor
     """
@@ -50,9 +70,22 @@ class MFSortDetector(cpe.Node):
         iou_thresh: float = 0.5,
         name: str = "MFSortDetector",
         frames_key: str = "frame",
+        weights_sha256: Optional[str] = None,
+        detect_every: int = 1,
+        redetect_conf_thresh: Optional[float] = None,
+        max_batch_size: int = 16,
+        letterbox: bool = False,
         **kwargs,
     ) -> None:
         self.weights = weights
+        self.weights_sha256 = weights_sha256
+        self.detect_every = max(1, detect_every)
+        self.redetect_conf_thresh = redetect_conf_thresh
+        self._skipped: Dict[str, int] = {}
+        self._low_confidence: Dict[str, bool] = {}
+        self.max_batch_size = max(1, max_batch_size)
+        self.letterbox = letterbox
+        self.letterbox_pool = FrameBufferPool(size=2)
         self.detector_kwargs = {
             "weights": weights,
             "imgsz": imgsz,
@@ -69,48 +102,119 @@ class MFSortDetector(cpe.Node):
         from mf_sort.detector import Detector
 
         if self.detector_kwargs["weights"].startswith("http"):
-            with tempfile.NamedTemporaryFile(suffix=".pt") as f:
-                self.detector_kwargs["weights"] = self.download_weights(
-                    self.detector_kwargs["weights"], f.name
-                )
-                self.detector = Detector(**self.detector_kwargs)
+            self.detector_kwargs["weights"] = self.download_weights(
+                self.detector_kwargs["weights"], self.weights_sha256
+            )
+            self.detector = Detector(**self.detector_kwargs)
         else:
             self.detector_kwargs["device"] = "cuda"
             self.detector = Detector(**self.detector_kwargs)
 
     def step(self, data_chunks: Dict[str, cpe.DataChunk]) -> cpe.DataChunk:
         ret_chunk = cpe.DataChunk()
-        ret_frames = []
+        ret_frames: List[MFSortFrame] = []
+        # (input name, index in ret_frames) of the frames to detect
+        pending: List[Tuple[str, int]] = []
         for name, data_chunk in data_chunks.items():
             self.logger.debug(f"{self}: got from {name}, data={data_chunk}")
             frames: List[MFSortFrame] = data_chunk.get(self.frames_key)["value"]
             for frame in frames:
-                img = frame.arr
-                detections = self.detector.predict([img])[0]
-                new_frame = MFSortFrame(
-                    arr=img,
-                    frame_count=frame.frame_count,
-                    src_id=frame.src_id,
-                    detections=[
-                        MFSortTrackedDetections(
-                            tracker_id=None, bboxes=detections
-                        )
-                    ],
-                    all_boxes=detections,
+                detected = self._should_detect(frame.src_id)
+                if detected:
+                    pending.append((name, len(ret_frames)))
+                ret_frames.append(
+                    MFSortFrame(
+                        arr=frame.arr,
+                        frame_count=frame.frame_count,
+                        src_id=frame.src_id,
+                        handle=frame.handle,
+                        timestamp=frame.timestamp,
+                        detected=detected,
+                    )
                 )
 
+        for start in range(0, len(pending), self.max_batch_size):
+            batch = pending[start : start + self.max_batch_size]
+            imgs = [ret_frames[idx].arr for _, idx in batch]
+            # results are in the order of the batch
+            for (name, idx), boxes in zip(batch, self._predict(imgs)):
+                frame = ret_frames[idx]
+                self._update_confidence(frame.src_id, boxes)
+                frame.detections = [
+                    MFSortTrackedDetections(tracker_id=None, bboxes=boxes)
+                ]
+                frame.all_boxes = boxes
+
                 if self.debug:
-                    for detection in detections:
-                        self.paint(img, *detection.tlwh.astype(int))
+                    # Draw on a copy, the frame may be shared with other nodes
+                    img = frame.arr.copy()
+                    for tlwh in boxes.tlwh.astype(int):
+                        self.paint(img, *tlwh)
                     cv2.imshow(name, img)
                     cv2.waitKey(1)
 
-                ret_frames.append(new_frame)
-
         ret_chunk.add(self.frames_key, ret_frames)
 
         return ret_chunk
 
+    def _predict(self, imgs: List[np.ndarray]) -> List[DetectionArray]:
+        """Predict a batch of frames, letterboxed to a common size if enabled."""
+        shapes = {img.shape for img in imgs}
+        if not self.letterbox or len(shapes) == 1:
+            return [
+                DetectionArray.from_detections(detections)
+                for detections in self.detector.predict(imgs)
+            ]
+
+        height = max(shape[0] for shape in shapes)
+        width = max(shape[1] for shape in shapes)
+        batch = self.letterbox_pool.acquire(
+            (self.max_batch_size, height, width, 3)
+        )
+        for i, img in enumerate(imgs):
+            h, w = img.shape[:2]
+            batch[i, :h, :w] = img
+            batch[i, h:, :] = 0
+            batch[i, :h, w:] = 0
+
+        results = self.detector.predict(list(batch[: len(imgs)]))
+        boxes = [DetectionArray.from_detections(result) for result in results]
+        for img, img_boxes in zip(imgs, boxes):
+            h, w = img.shape[:2]
+            self.clip(img_boxes.tlwh, w, h)
+        return boxes
+
+    @staticmethod
+    def clip(tlwh: np.ndarray, width: int, height: int) -> None:
+        """Clip (N, 4) tlwh boxes, in place, to an image of the given size."""
+        top_left = np.clip(tlwh[:, :2], 0, (width, height))
+        bottom_right = np.clip(tlwh[:, :2] + tlwh[:, 2:], 0, (width, height))
+        tlwh[:, :2] = top_left
+        tlwh[:, 2:] = bottom_right - top_left
+
+    def _should_detect(self, src_id: str) -> bool:
+        """Whether to run the detector on the next frame of a source."""
+        if self._low_confidence.get(src_id, False):
+            self._skipped[src_id] = 0
+            return True
+
+        skipped = self._skipped.get(src_id, self.detect_every - 1)
+        if skipped + 1 >= self.detect_every:
+            self._skipped[src_id] = 0
+            return True
+
+        self._skipped[src_id] = skipped + 1
+        return False
+
+    def _update_confidence(self, src_id: str, boxes: DetectionArray) -> None:
+        if self.redetect_conf_thresh is None:
+            return
+
+        self._low_confidence[src_id] = (
+            len(boxes) > 0
+            and float(boxes.confidence.mean()) < self.redetect_conf_thresh
+        )
+
     @staticmethod
     def paint(
         img: np.ndarray, t: int, l: int, w: int, h: int  # noqa: E741
@@ -118,7 +222,7 @@ class MFSortDetector(cpe.Node):
         cv2.rectangle(img, (t, l), ((t + w), (l + h)), (0, 255, 0), 2)
 
     @staticmethod
-    def download_weights(url: str, fname: str) -> str:
-        return download_file(
-            url, fname, chunk_size=1024, desc="Downloading weights"
+    def download_weights(url: str, sha256: Optional[str] = None) -> str:
+        return str(
+            cached_download(url, sha256=sha256, desc="Downloading weights")
         )
@@ -0,0 +1,221 @@
+from typing import Tuple
+
+import numpy as np
+
+# Constant velocity model over (cx, cy, area, aspect ratio, vcx, vcy, varea)
+_F = np.eye(7)
+_F[[0, 1, 2], [4, 5, 6]] = 1
+_Q = np.diag([1, 1, 1, 1, 0.01, 0.01, 1e-4])
+_R = np.diag([1, 1, 10, 10])
+_P0 = np.diag([10, 10, 10, 10, 1e4, 1e4, 1e4])
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """The IoU of every pair of (N, 4) and (M, 4) tlwh boxes, as (N, M)."""
+    a_br = a[:, None, :2] + a[:, None, 2:]
+    b_br = b[None, :, :2] + b[None, :, 2:]
+    wh = np.minimum(a_br, b_br) - np.maximum(a[:, None, :2], b[None, :, :2])
+    inter = np.prod(np.clip(wh, 0, None), axis=2)
+    area_a = np.prod(a[:, 2:], axis=1)[:, None]
+    area_b = np.prod(b[:, 2:], axis=1)[None, :]
+    return inter / np.maximum(area_a + area_b - inter, 1e-9)
+
+
+def linear_assignment(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Minimum cost matching of rows to columns.
+
+    Uses ``scipy.optimize.linear_sum_assignment`` when scipy is installed,
+    and otherwise matches greedily in order of increasing cost.
+    """
+    try:
+        from scipy.optimize import linear_sum_assignment
+    except ImportError:
+        return _greedy_assignment(cost)
+
+    return linear_sum_assignment(cost)
+
+
+def _greedy_assignment(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    rows, cols = [], []
+    used_rows = np.zeros(cost.shape[0], dtype=bool)
+    used_cols = np.zeros(cost.shape[1], dtype=bool)
+    for idx in np.argsort(cost, axis=None):
+        row, col = divmod(int(idx), cost.shape[1])
+        if not used_rows[row] and not used_cols[col]:
+            used_rows[row] = used_cols[col] = True
+            rows.append(row)
+            cols.append(col)
+            if len(rows) == min(cost.shape):
+                break
+    return np.asarray(rows, dtype=int), np.asarray(cols, dtype=int)
+
+
+def tlwh_to_z(tlwh: np.ndarray) -> np.ndarray:
+    """Convert (N, 4) tlwh boxes to (N, 4) center, area and aspect ratio."""
+    w, h = tlwh[:, 2], tlwh[:, 3]
+    return np.stack(
+        [
+            tlwh[:, 0] + w / 2,
+            tlwh[:, 1] + h / 2,
+            w * h,
+            w / np.maximum(h, 1e-9),
+        ],
+        axis=1,
+    )
+
+
+def z_to_tlwh(z: np.ndarray) -> np.ndarray:
+    """Convert (N, 4+) center, area and aspect ratio to (N, 4) tlwh boxes."""
+    area = np.maximum(z[:, 2], 1e-9)
+    w = np.sqrt(area * np.maximum(z[:, 3], 1e-9))
+    h = area / w
+    return np.stack([z[:, 0] - w / 2, z[:, 1] - h / 2, w, h], axis=1)
+
+
+class NumpyTracker:
+    """A SORT tracker that keeps the state of all tracks in NumPy arrays.
+
+    Every track is a constant velocity Kalman filter over its box center, area
+    and aspect ratio. Predictions and updates are batched over all tracks,
+    and detections are matched to the predicted boxes by IoU with a linear
+    assignment.
+
+    Parameters
+    ----------
+    max_age : int, optional (default: 30)
+        The number of frames a track is kept without a matching detection
+    min_hits : int, optional (default: 3)
+        The number of matched detections before a track is reported
+    iou_threshold : float, optional (default: 0.7)
+        The maximum IoU distance (1 - IoU) of a match, like MF_SORT's
+    """
+
+    def __init__(
+        self, max_age: int = 30, min_hits: int = 3, iou_threshold: float = 0.7
+    ) -> None:
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self.iou_threshold = iou_threshold
+
+        self.frame_count = 0
+        self.next_id = 1
+        self.x = np.zeros((0, 7))
+        self.P = np.zeros((0, 7, 7))
+        self.ids = np.zeros(0, dtype=int)
+        self.hits = np.zeros(0, dtype=int)
+        self.age = np.zeros(0, dtype=int)  # frames since the last match
+        self.confidence = np.zeros(0)
+        self.cls = np.zeros(0, dtype=int)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def predict(self) -> np.ndarray:
+        """Advance all tracks by one frame and return their (T, 4) tlwh."""
+        # Keep the area positive when it shrinks quickly
+        shrinking = self.x[:, 2] + self.x[:, 6] <= 0
+        self.x[shrinking, 6] = 0
+
+        self.x = self.x @ _F.T
+        self.P = _F @ self.P @ _F.T + _Q
+        self.age += 1
+        return z_to_tlwh(self.x)
+
+    def update(
+        self,
+        tlwh: np.ndarray,
+        confidence: np.ndarray,
+        cls: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Track the detections of the next frame.
+
+        Parameters
+        ----------
+        tlwh : np.ndarray
+            The (N, 4) boxes of the detections
+        confidence : np.ndarray
+            The (N,) confidences of the detections
+        cls : np.ndarray
+            The (N,) classes of the detections
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+            The tlwh boxes, confidences, classes and ids of the confirmed
+            tracks matched in this frame
+        """
+        tlwh = np.asarray(tlwh, dtype=float).reshape(-1, 4)
+        confidence = np.asarray(confidence, dtype=float).reshape(-1)
+        cls = np.asarray(cls, dtype=int).reshape(-1)
+        self.frame_count += 1
+
+        predicted = self.predict()
+        rows = cols = np.zeros(0, dtype=int)
+        if len(self) and len(tlwh):
+            cost = 1 - iou_matrix(predicted, tlwh)
+            rows, cols = linear_assignment(cost)
+            keep = cost[rows, cols] <= self.iou_threshold
+            rows, cols = rows[keep], cols[keep]
+
+        self._correct(rows, tlwh[cols])
+        self.hits[rows] += 1
+        self.age[rows] = 0
+        self.confidence[rows] = confidence[cols]
+        self.cls[rows] = cls[cols]
+
+        unmatched = np.ones(len(tlwh), dtype=bool)
+        unmatched[cols] = False
+        self._create(tlwh[unmatched], confidence[unmatched], cls[unmatched])
+
+        alive = self.age <= self.max_age
+        if not alive.all():
+            self._select(alive)
+
+        reported = (self.age == 0) & (
+            (self.hits >= self.min_hits) | (self.frame_count <= self.min_hits)
+        )
+        return (
+            z_to_tlwh(self.x[reported]),
+            self.confidence[reported],
+            self.cls[reported],
+            self.ids[reported],
+        )
+
+    def _correct(self, idx: np.ndarray, tlwh: np.ndarray) -> None:
+        """Kalman update of the tracks ``idx`` with their matched boxes."""
+        if not len(idx):
+            return
+
+        x, P = self.x[idx], self.P[idx]
+        y = tlwh_to_z(tlwh) - x[:, :4]
+        S = P[:, :4, :4] + _R
+        # K = P H^T S^-1, solved as S^T K^T = H P^T (S is symmetric)
+        K = np.linalg.solve(S, P[:, :4, :]).transpose(0, 2, 1)
+        self.x[idx] = x + np.einsum("tij,tj->ti", K, y)
+        self.P[idx] = P - K @ P[:, :4, :]
+
+    def _create(
+        self, tlwh: np.ndarray, confidence: np.ndarray, cls: np.ndarray
+    ) -> None:
+        n = len(tlwh)
+        if not n:
+            return
+
+        x = np.zeros((n, 7))
+        x[:, :4] = tlwh_to_z(tlwh)
+        self.x = np.concatenate([self.x, x])
+        self.P = np.concatenate([self.P, np.broadcast_to(_P0, (n, 7, 7))])
+        self.ids = np.concatenate(
+            [self.ids, np.arange(self.next_id, self.next_id + n)]
+        )
+        self.next_id += n
+        self.hits = np.concatenate([self.hits, np.ones(n, dtype=int)])
+        self.age = np.concatenate([self.age, np.zeros(n, dtype=int)])
+        self.confidence = np.concatenate([self.confidence, confidence])
+        self.cls = np.concatenate([self.cls, cls])
+
+    def _select(self, mask: np.ndarray) -> None:
+        self.x, self.P = self.x[mask], self.P[mask]
+        self.ids, self.hits = self.ids[mask], self.hits[mask]
+        self.age = self.age[mask]
+        self.confidence, self.cls = self.confidence[mask], self.cls[mask]
@@ -1,5 +1,6 @@
 import typing
-from typing import Dict, List, Optional, Type
+import zlib
+from typing import Dict, List, Literal, Optional, Tuple, Type, Union
 
 if typing.TYPE_CHECKING:
     from mf_sort import MF_SORT, Detection
@@ -9,9 +10,11 @@ import numpy as np
 import chimerapy.engine as cpe
 from chimerapy.orchestrator import step_node
 from chimerapy.pipelines.mf_sort_tracking.data import (
+    DetectionArray,
     MFSortFrame,
     MFSortTrackedDetections,
 )
+from chimerapy.pipelines.mf_sort_tracking.numpy_tracker import NumpyTracker
 
 
 @step_node(name="CPPipelines_MFSortTracker")
@@ -20,8 +23,10 @@ class MFSortTracker(cpe.Node):
 
     Parameters
     ----------
-    source_key: str, required
-        The source key to use for tracking objects in the video stream
+    source_key: str, optional (default: None)
+        The source to track objects in. If None, every source is tracked in
+        this node, each with its own MF_SORT tracker, so that a single node
+        replaces one tracker node per source
     max_age: int, optional (default: 30)
         The maximum age of a track
     min_hits: int, optional (default: 3)
@@ -34,19 +39,34 @@ class MFSortTracker(cpe.Node):
         The target class to track
     bboxes_key: str, optional (default: "bboxes")
         The key to use for the bboxes in the data chunk
+    backend: Literal["mf_sort", "numpy"], optional (default: "mf_sort")
+        The tracker implementation. "numpy" uses NumpyTracker, which keeps
+        the state of all tracks in arrays and batches the Kalman filters,
+        which is cheaper in crowded scenes, and does not require mf_sort
     **kwargs
         Additional keyword arguments to pass to the Node constructor
+
+    Notes
+    -----
+    On frames the detector skipped (``detected=False``, see MFSortDetector's
+    ``detect_every``), the Kalman filters of the tracker are advanced by one
+    frame without a measurement. The predicted boxes of the tracks reported on
+    the last detected frame are emitted with ``predicted=True``.
+
+    Track colors are derived from the source and the track id, so a track
+    keeps its color whether its source is tracked alone or with others.
     """
 
     def __init__(
         self,
-        source_key: str,
+        source_key: Optional[str] = None,
         max_age: int = 30,
         min_hits: int = 3,
         iou_threshold: float = 0.7,
         name="MF_SORTTracker",
         target_class: int = 0,
         frames_key: str = "frame",
+        backend: Literal["mf_sort", "numpy"] = "mf_sort",
         **kwargs,
     ) -> None:
         self.tracker_kwargs = {
@@ -57,61 +77,113 @@ class MFSortTracker(cpe.Node):
         self.target_class = target_class
         self.source_key = source_key
         self.frames_key = frames_key
+        self.backend = backend
 
-        self.tracker: Optional["MF_SORT"] = None
+        self.trackers: Dict[str, Union["MF_SORT", NumpyTracker]] = {}
         self.Detection: Optional[Type["Detection"]] = None
+        self.MF_SORT: Optional[Type["MF_SORT"]] = None
+        # src_id -> the tracks reported on the last detected frame
+        self._reported: Dict[str, DetectionArray] = {}
+        self._colors: Dict[str, np.ndarray] = {}
         super().__init__(name=name, **kwargs)
 
     def setup(self) -> None:
-        from mf_sort import MF_SORT, Detection
-
-        self.Detection = Detection
-        self.tracker = MF_SORT(**self.tracker_kwargs)
-        self.COLORS = np.random.randint(
-            0, 255, size=(200, 3), dtype="int"
-        )  # UpTo 200 Tracked Objects
+        if self.backend == "mf_sort":
+            from mf_sort import MF_SORT, Detection
 
-    def _filter_detections(
-        self, tracked_detections: List[MFSortTrackedDetections]
-    ) -> List["Detection"]:
-        filtered_detections = []
+            self.Detection = Detection
+            self.MF_SORT = MF_SORT
 
-        for detection in tracked_detections:
-            for bbox in detection.bboxes:
-                if bbox.cls == self.target_class:
-                    filtered_detections.append(bbox)
+        if self.source_key is not None:
+            self._get_tracker(self.source_key)
 
-        return filtered_detections
+    def _get_tracker(self, src_id: str) -> Union["MF_SORT", NumpyTracker]:
+        if src_id not in self.trackers:
+            tracker_cls = (
+                NumpyTracker if self.backend == "numpy" else self.MF_SORT
+            )
+            self.trackers[src_id] = tracker_cls(**self.tracker_kwargs)
+        return self.trackers[src_id]
 
-    def _tracker_step(
-        self, detections: List["Detection"]
+    def _filter_detections(
+        self, tracked_detections: List[MFSortTrackedDetections]
+    ) -> DetectionArray:
+        boxes = DetectionArray.concat(
+            [detection.bboxes for detection in tracked_detections]
+        )
+        return boxes[boxes.cls == self.target_class]
+
+    def _track_color(self, src_id: str, trk_id: int) -> Tuple[int, int, int]:
+        if src_id not in self._colors:
+            # Seeded by the source, so colors match across nodes and runs
+            rng = np.random.default_rng(zlib.crc32(src_id.encode()))
+            self._colors[src_id] = rng.integers(
+                0, 255, size=(200, 3)
+            )  # UpTo 200 Tracked Objects
+        colors = self._colors[src_id]
+        return tuple(int(i) for i in colors[trk_id % len(colors)])
+
+    def _split_tracks(
+        self, src_id: str, tracked: DetectionArray, predicted: bool = False
     ) -> List[MFSortTrackedDetections]:
-        results = self.tracker.step(detections)
-
-        detections_by_track_id = {}
-
-        for trk, trk_id in results:
-            if trk_id not in detections_by_track_id:
-                detections_by_track_id[trk_id] = []
+        """Group tracked boxes by track, as views of the sorted boxes."""
+        tracked = tracked[np.argsort(tracked.track_id, kind="stable")]
+        trk_ids, starts = np.unique(tracked.track_id, return_index=True)
+        ends = np.append(starts[1:], len(tracked))
+        return [
+            MFSortTrackedDetections(
+                tracker_id=int(trk_id),
+                color=self._track_color(src_id, int(trk_id)),
+                bboxes=tracked[start:end],
+                predicted=predicted,
+            )
+            for trk_id, start, end in zip(trk_ids, starts, ends)
+        ]
 
-            det = self.Detection(
-                np.squeeze(trk.tlwh.copy()),
-                trk.confidence,
-                trk.cls,
+    def _predict_step(self, src_id: str) -> DetectionArray:
+        """Advance the tracks of a source by a frame without detections."""
+        reported = self._reported.get(src_id)
+        if reported is None:
+            return DetectionArray()
+
+        tracker = self._get_tracker(src_id)
+        if isinstance(tracker, NumpyTracker):
+            tlwh = tracker.predict()
+            keep = np.isin(tracker.ids, reported.track_id)
+            return DetectionArray(
+                tlwh[keep],
+                tracker.confidence[keep],
+                tracker.cls[keep],
+                tracker.ids[keep],
             )
 
-            detections_by_track_id[trk_id].append(det)
+        for track in tracker.tracks:
+            track.predict(tracker.kf)
+        states = {track.track_id: track.to_tlwh() for track in tracker.tracks}
+        reported = reported[np.isin(reported.track_id, list(states))]
+        return DetectionArray(
+            [states[trk_id] for trk_id in reported.track_id],
+            reported.confidence,
+            reported.cls,
+            reported.track_id,
+        )
 
-        return [
-            MFSortTrackedDetections(
-                tracker_id=trk_id,
-                color=tuple(
-                    int(i) for i in self.COLORS[trk_id % len(self.COLORS)]
-                ),
-                bboxes=detections,
+    def _tracker_step(
+        self, src_id: str, boxes: DetectionArray
+    ) -> DetectionArray:
+        tracker = self._get_tracker(src_id)
+        if isinstance(tracker, NumpyTracker):
+            return DetectionArray(
+                *tracker.update(boxes.tlwh, boxes.confidence, boxes.cls)
             )
-            for trk_id, detections in detections_by_track_id.items()
-        ]
+
+        results = list(tracker.step(boxes.to_detections(self.Detection)))
+        return DetectionArray(
+            [np.squeeze(trk.tlwh) for trk, _ in results],
+            [trk.confidence for trk, _ in results],
+            [trk.cls for trk, _ in results],
+            [trk_id for _, trk_id in results],
+        )
 
     def step(self, data_chunks: Dict[str, cpe.DataChunk]) -> cpe.DataChunk:
         ret_chunk = cpe.DataChunk()
@@ -120,11 +192,18 @@ class MFSortTracker(cpe.Node):
         for name, data_chunk in data_chunks.items():  # noqa: B007
             frames: List[MFSortFrame] = data_chunk.get(self.frames_key)["value"]
             for frame in frames:
-                if self.source_key == frame.src_id:
-                    filtered_detections = self._filter_detections(
-                        frame.detections
+                if self.source_key in (None, frame.src_id):
+                    src_id = frame.src_id
+                    if frame.detected:
+                        tracked = self._tracker_step(
+                            src_id, self._filter_detections(frame.detections)
+                        )
+                        self._reported[src_id] = tracked
+                    else:
+                        tracked = self._predict_step(src_id)
+                    frame_detections = self._split_tracks(
+                        src_id, tracked, predicted=not frame.detected
                     )
-                    frame_detections = self._tracker_step(filtered_detections)
 
                     tracked_frames.append(
                         MFSortFrame(
@@ -133,6 +212,9 @@ class MFSortTracker(cpe.Node):
                             src_id=frame.src_id,
                             detections=frame_detections,
                             all_boxes=frame.all_boxes,
+                            handle=frame.handle,
+                            timestamp=frame.timestamp,
+                            detected=frame.detected,
                         )
                     )
 
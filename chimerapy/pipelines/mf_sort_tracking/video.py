@@ -1,27 +1,94 @@
+from typing import Optional
+
 import chimerapy.engine as cpe
 from chimerapy.orchestrator import source_node
+from chimerapy.pipelines.generic_nodes.shared_frames import SharedFrameRing
 from chimerapy.pipelines.generic_nodes.video_nodes import Video
 from chimerapy.pipelines.mf_sort_tracking.data import MFSortFrame
 
 
 @source_node(name="CPPipelines_MFSortVideo")
 class MFSortVideo(Video):
-    """A video node that returns a Frame object with identifiable metadata."""
+    """A video node that returns a Frame object with identifiable metadata.
+
+    Parameters
+    ----------
+    shared_memory: bool, optional (default: False)
+        If True, write frames into a shared memory ring and ship only a handle
+        to them, so that nodes on the same machine map the frames instead of
+        unpickling a copy. Only use this when all downstream nodes run on the
+        same machine
+    shared_memory_slots: int, optional (default: 32)
+        The number of frames held by the ring. A frame must be consumed by
+        every downstream node before this many newer frames are produced
+    batch_size: int, optional (default: 1)
+        The maximum number of frames emitted together in one data chunk
+    batch_timeout_ms: float, optional (default: None)
+        If provided, emit a partial batch once this many milliseconds have
+        elapsed since its first frame
+    *args, **kwargs
+        Arguments passed to the Video node
+    """
 
-    def __init__(self, *args, **kwargs) -> None:
+    def __init__(
+        self,
+        *args,
+        shared_memory: bool = False,
+        shared_memory_slots: int = 32,
+        batch_size: int = 1,
+        batch_timeout_ms: Optional[float] = None,
+        **kwargs,
+    ) -> None:
         super().__init__(*args, **kwargs)
+        if shared_memory and batch_size >= shared_memory_slots:
+            raise ValueError(
+                "shared_memory_slots must exceed batch_size, got "
+                f"{shared_memory_slots} slots for batches of {batch_size}"
+            )
+
         self.include_meta = True
+        self.shared_memory = shared_memory
+        self.shared_memory_slots = shared_memory_slots
+        self.batch_size = batch_size
+        self.batch_timeout_ms = batch_timeout_ms
+        self.ring: Optional[SharedFrameRing] = None
 
     def step(self) -> cpe.DataChunk:
-        data_chunk = super().step()
         ret_chunk = cpe.DataChunk()
-        frame_arr = data_chunk.get(self.frame_key)["value"]
-        src_id = data_chunk.get("metadata")["value"]["source_name"]
-        frame_count = data_chunk.get("metadata")["value"]["frame_count"]
+        frames = []
+        for data_chunk in self.step_batch(
+            self.batch_size, self.batch_timeout_ms
+        ):
+            frame_arr = data_chunk.get(self.frame_key)["value"]
+            meta = data_chunk.get("metadata")["value"]
+
+            handle = None
+            if self.shared_memory:
+                if self.ring is None:
+                    self.ring = SharedFrameRing(
+                        self.shared_memory_slots, frame_arr.nbytes
+                    )
 
-        ret_chunk.add(
-            self.frame_key,
-            [MFSortFrame(frame_arr, src_id=src_id, frame_count=frame_count)],
-        )
+                # Frames larger than a slot (e.g. a read error frame) are inlined
+                if self.ring.fits(frame_arr):
+                    frame_arr, handle = self.ring.write(frame_arr)
+
+            frames.append(
+                MFSortFrame(
+                    frame_arr,
+                    src_id=meta["source_name"],
+                    frame_count=meta["frame_count"],
+                    handle=handle,
+                    timestamp=meta["timestamp"],
+                )
+            )
+
+        ret_chunk.add(self.frame_key, frames)
 
         return ret_chunk
+
+    def teardown(self) -> None:
+        super().teardown()
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
@@ -0,0 +1,213 @@
+import argparse
+import json
+import logging
+import os
+import pathlib
+import time
+import zipfile
+from typing import Any, Callable, Dict, Optional, Sequence, TypeVar, Union
+
+from chimerapy.pipelines.utils import (
+    ChecksumError,
+    FileLock,
+    cached_download,
+    cached_path,
+    get_cache_dir,
+)
+
+T = TypeVar("T")
+
+YOLOV5_REF = "v7.0"
+
+# The code repositories installable by name
+REPO_URLS = {
+    "yolov5": f"https://github.com/ultralytics/yolov5/archive/refs/tags/{YOLOV5_REF}.zip",
+}
+
+
+def default_weights_url(name: str) -> Optional[str]:
+    """The release url of the ``yolov5*`` and ``yolov8*`` weights, by name."""
+    name = name[: -len(".pt")] if name.endswith(".pt") else name
+    if name.startswith("yolov5"):
+        return f"https://github.com/ultralytics/yolov5/releases/download/{YOLOV5_REF}/{name}.pt"
+    if name.startswith("yolov8"):
+        return f"https://github.com/ultralytics/assets/releases/download/v0.0.0/{name}.pt"
+    return None
+
+
+class ModelStore:
+    """A local store of model weights and code, pinned by content hash.
+
+    Weights and code archives are downloaded into the content-addressed asset
+    cache once. The sha256 of every installed item is pinned in the store
+    manifest on first install (trust on first use), or to the hash given at
+    install time. Later lookups resolve the pinned file locally, without any
+    network access, so nodes start offline once their models are installed
+    (e.g. with ``python -m chimerapy.pipelines.model_store install yolov5s``).
+
+    Parameters
+    ----------
+    root : str or pathlib.Path, optional
+        The store directory, defaults to the ``models`` package cache
+    logger : logging.Logger, optional
+        The logger used to report installs and load times
+    """
+
+    def __init__(
+        self,
+        root: Optional[Union[str, pathlib.Path]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.root = pathlib.Path(root or get_cache_dir("models"))
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.root / "manifest.json"
+        self.logger = logger or logging.getLogger(__name__)
+        self.load_times: Dict[str, float] = {}
+
+    def manifest(self) -> Dict[str, Dict[str, Any]]:
+        if not self.manifest_path.exists():
+            return {}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def weights(
+        self,
+        name: str,
+        url: Optional[str] = None,
+        sha256: Optional[str] = None,
+    ) -> pathlib.Path:
+        """The local path of a weights file, installing it if needed.
+
+        Parameters
+        ----------
+        name : str
+            A local file path, or the name of the weights (e.g. "yolov5s",
+            "yolov8n-pose")
+        url : str, optional
+            Where to download the weights from, defaults to the release url
+            of the yolov5 and yolov8 weights
+        sha256 : str, optional
+            The expected sha256 of the weights. If None, the hash pinned at
+            the first install is expected
+
+        Returns
+        -------
+        pathlib.Path
+            The path of the weights file
+        """
+        if os.path.exists(name):
+            return pathlib.Path(name)
+
+        url = url or self._pinned(name, "url") or default_weights_url(name)
+        if url is None:
+            raise KeyError(f"Unknown weights {name}, provide their url")
+
+        return self._install(name, url, sha256)
+
+    def repo(
+        self,
+        name: str,
+        url: Optional[str] = None,
+        sha256: Optional[str] = None,
+    ) -> pathlib.Path:
+        """The local directory of a code repository, installing it if needed.
+
+        The repository is downloaded as a zip archive and extracted into the
+        store, keyed by the archive hash.
+        """
+        url = url or self._pinned(name, "url") or REPO_URLS.get(name)
+        if url is None:
+            raise KeyError(f"Unknown repository {name}, provide its url")
+
+        archive = self._install(name, url, sha256)
+        target = self.root / "repos" / archive.stem
+        with FileLock(self.root / f"{archive.stem}.lock"):
+            if not target.exists():
+                tmp = target.with_suffix(".tmp")
+                with zipfile.ZipFile(archive) as zf:
+                    zf.extractall(tmp)
+                os.replace(tmp, target)
+
+        # GitHub archives have a single top-level directory
+        entries = list(target.iterdir())
+        return (
+            entries[0] if len(entries) == 1 and entries[0].is_dir() else target
+        )
+
+    def load(self, name: str, loader: Callable[[], T]) -> T:
+        """Call ``loader`` and report how long loading the model took."""
+        start = time.perf_counter()
+        model = loader()
+        elapsed = time.perf_counter() - start
+        self.load_times[name] = elapsed
+        self.logger.info(f"Loaded model {name} in {elapsed:.2f}s")
+        return model
+
+    def _pinned(self, name: str, field: str) -> Optional[str]:
+        return self.manifest().get(name, {}).get(field)
+
+    def _install(
+        self, name: str, url: str, sha256: Optional[str]
+    ) -> pathlib.Path:
+        pinned = self._pinned(name, "sha256")
+        sha256 = sha256.lower() if sha256 else None
+        if pinned and sha256 and pinned != sha256:
+            raise ChecksumError(
+                f"{name} is pinned to sha256 {pinned}, not {sha256}. Remove "
+                f"it from {self.manifest_path} to install another version"
+            )
+        sha256 = sha256 or pinned
+
+        path = cached_path(url, sha256)
+        if path is None:
+            self.logger.info(f"Installing {name} from {url}")
+            path = cached_download(
+                url, sha256=sha256, desc=f"Installing {name}"
+            )
+
+        if not pinned:
+            self._pin(name, url, path.stem)
+
+        return path
+
+    def _pin(self, name: str, url: str, sha256: str) -> None:
+        with FileLock(self.root / "manifest.lock"):
+            manifest = self.manifest()
+            manifest[name] = {"url": url, "sha256": sha256}
+            tmp = self.manifest_path.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp, self.manifest_path)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Install model weights and code into the local model "
+        "store, so that inference nodes load them without network access."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    install = subparsers.add_parser("install", help="install weights")
+    install.add_argument("names", nargs="+", help="e.g. yolov5s yolov8n-pose")
+    install.add_argument("--url", default=None, help="url of a single name")
+    install.add_argument("--sha256", default=None, help="expected sha256")
+    subparsers.add_parser("list", help="list the pinned items")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    store = ModelStore()
+    if args.command == "install":
+        for name in args.names:
+            if name in REPO_URLS:
+                path = store.repo(name, args.url, args.sha256)
+            else:
+                path = store.weights(name, args.url, args.sha256)
+            print(f"{name}: {path}")
+
+    for name, item in store.manifest().items():
+        print(f"{name:24} {item['sha256']}  {item['url']}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
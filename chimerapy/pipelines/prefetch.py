@@ -0,0 +1,135 @@
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from chimerapy.pipelines.utils import cached_download
+
+
+@dataclass
+class Asset:
+    """A remote file referenced by a node of a pipeline config."""
+
+    url: str
+    sha256: Optional[str] = None
+    nodes: List[str] = field(default_factory=list)
+
+
+def find_assets(configs: Iterable[Dict[str, Any]]) -> List[Asset]:
+    """Collect the url-valued node kwargs of pipeline configs.
+
+    The expected sha256 of an asset is read from a sibling ``<kwarg>_sha256``
+    kwarg, or ``<prefix>_sha256`` for kwargs named ``<prefix>_<suffix>`` (e.g.
+    ``video_sha256`` for ``video_src``).
+    """
+    assets: Dict[str, Asset] = {}
+    for config in configs:
+        for node in config.get("nodes", []):
+            kwargs = node.get("kwargs", {})
+            for key, value in kwargs.items():
+                if not isinstance(value, str) or not value.startswith("http"):
+                    continue
+
+                sha256 = kwargs.get(f"{key}_sha256") or kwargs.get(
+                    f"{key.rsplit('_', 1)[0]}_sha256"
+                )
+                asset = assets.setdefault(value, Asset(value, sha256))
+                asset.sha256 = asset.sha256 or sha256
+                asset.nodes.append(node.get("name", node.get("registry_name")))
+
+    return list(assets.values())
+
+
+def prefetch(
+    assets: Sequence[Asset],
+    workers: int = 4,
+    parallel_chunks: int = 4,
+    cache_dir: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Download assets into the package cache concurrently.
+
+    Returns one summary row (url, path, size, seconds, error) per asset.
+    """
+
+    def fetch(asset: Asset) -> Dict[str, Any]:
+        row = {"url": asset.url, "path": None, "size": 0, "error": None}
+        start = time.perf_counter()
+        try:
+            path = cached_download(
+                asset.url,
+                sha256=asset.sha256,
+                desc=asset.url.rsplit("/", 1)[-1][:32],
+                cache_dir=cache_dir,
+                parallel_chunks=parallel_chunks,
+            )
+            row["path"] = str(path)
+            row["size"] = path.stat().st_size
+        except Exception as e:
+            row["error"] = f"{type(e).__name__}: {e}"
+        row["seconds"] = time.perf_counter() - start
+        return row
+
+    with ThreadPoolExecutor(max(1, workers)) as executor:
+        return list(executor.map(fetch, assets))
+
+
+def _format_size(size: float) -> str:
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Download the remote videos, logs and weights of pipeline "
+        "configs into the local cache, so that node setup only reads local "
+        "files. The cache directory can be shared by setting "
+        "CHIMERAPY_PIPELINES_CACHE."
+    )
+    parser.add_argument("configs", nargs="+", help="pipeline config files")
+    parser.add_argument(
+        "--workers", type=int, default=4, help="files downloaded concurrently"
+    )
+    parser.add_argument(
+        "--chunks",
+        type=int,
+        default=4,
+        help="concurrent byte ranges per large file",
+    )
+    parser.add_argument("--cache-dir", default=None, help="cache directory")
+    args = parser.parse_args(argv)
+
+    configs = []
+    for fname in args.configs:
+        with open(fname) as f:
+            configs.append(json.load(f))
+
+    assets = find_assets(configs)
+    print(f"Prefetching {len(assets)} assets")
+    rows = prefetch(assets, args.workers, args.chunks, args.cache_dir)
+
+    failed = 0
+    for row in rows:
+        if row["error"] is None:
+            print(
+                f"OK    {_format_size(row['size']):>10} "
+                f"{row['seconds']:7.1f}s  {row['url']}\n      -> {row['path']}"
+            )
+        else:
+            failed += 1
+            print(f"FAIL  {row['url']}\n      {row['error']}")
+
+    total = sum(row["size"] for row in rows)
+    print(
+        f"{len(rows) - failed}/{len(rows)} assets cached "
+        f"({_format_size(total)})"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,13 @@
+import hashlib
 import importlib
-from typing import Callable
+import json
+import os
+import pathlib
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Mapping, Optional, Tuple, Union
 
 import requests
 from tqdm import tqdm
@@ -9,6 +17,10 @@ class UnmetDependencyError(ImportError):
     pass
 
 
+class ChecksumError(ValueError):
+    pass
+
+
 def requires_packages(*packages: str) -> Callable:
     """Decorator to check if the required packages are installed."""
 
@@ -56,3 +68,342 @@ def download_file(
             bar.update(size)
 
     return fname
+
+
+def get_cache_dir(subdir: Optional[str] = None) -> pathlib.Path:
+    """The directory used to cache downloads and decoded data.
+
+    Defaults to ``~/.cache/chimerapy-pipelines`` and can be overridden with
+    the ``CHIMERAPY_PIPELINES_CACHE`` environment variable.
+    """
+    root = os.environ.get(
+        "CHIMERAPY_PIPELINES_CACHE",
+        pathlib.Path.home() / ".cache" / "chimerapy-pipelines",
+    )
+    cache_dir = pathlib.Path(root)
+    if subdir:
+        cache_dir = cache_dir / subdir
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def file_sha256(
+    fname: Union[str, pathlib.Path], chunk_size: int = 1024 * 1024
+) -> str:
+    """The hex sha256 digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(fname, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def cached_download(
+    url: str,
+    sha256: Optional[str] = None,
+    chunk_size: int = 1024 * 1024,
+    desc: str = "Downloading File",
+    cache_dir: Optional[Union[str, pathlib.Path]] = None,
+    parallel_chunks: int = 1,
+    timeout: float = 30.0,
+) -> pathlib.Path:
+    """Download a file into the persistent asset cache, once.
+
+    Files are stored by content (``<sha256><suffix>``) and indexed by URL, so
+    later calls return the cached file without touching the network. An
+    interrupted download is resumed with an HTTP Range request, conditional
+    on the file being unchanged (``If-Range`` with the ETag or Last-Modified
+    date of the first response), and a lock file makes concurrent callers on
+    one machine share a single download.
+
+    Parameters
+    ----------
+    url : str
+        The url of the file
+    sha256 : str, optional
+        The expected hex sha256 of the file. A cached file with this digest is
+        used even if it was downloaded from another url, and a download that
+        does not match it raises a ChecksumError
+    chunk_size : int, optional (default: 1 MiB)
+        The size of the chunks streamed to disk
+    desc : str, optional (default: "Downloading File")
+        The description of the progress bar
+    cache_dir : str or pathlib.Path, optional
+        The cache directory, defaults to the ``assets`` package cache
+    parallel_chunks : int, optional (default: 1)
+        If larger than 1, download large files as this many byte ranges
+        fetched concurrently, when the server supports range requests
+    timeout : float, optional (default: 30.0)
+        The timeout, in seconds, of connecting to the server and of each read
+
+    Returns
+    -------
+    pathlib.Path
+        The path of the cached file
+    """
+    cache_dir = pathlib.Path(cache_dir or get_cache_dir("assets"))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    sha256 = sha256.lower() if sha256 else None
+
+    url_hash, suffix = _url_key(url)
+    index_path = cache_dir / f"{url_hash}.url.json"
+    part_path = cache_dir / f"{url_hash}.part"
+
+    with FileLock(cache_dir / f"{url_hash}.lock"):
+        path = cached_path(url, sha256, cache_dir)
+        if path is not None:
+            return path
+
+        if parallel_chunks > 1 and not part_path.exists():
+            _download_chunked(
+                url, part_path, parallel_chunks, chunk_size, desc, timeout
+            )
+        else:
+            _download_resumable(url, part_path, chunk_size, desc, timeout)
+
+        digest = file_sha256(part_path)
+        if sha256 is not None and digest != sha256:
+            part_path.unlink()
+            raise ChecksumError(
+                f"Downloaded {url} has sha256 {digest}, expected {sha256}"
+            )
+
+        path = cache_dir / f"{digest}{suffix}"
+        os.replace(part_path, path)
+        with open(index_path, "w") as f:
+            json.dump({"url": url, "sha256": digest}, f)
+
+    return path
+
+
+def cached_path(
+    url: str,
+    sha256: Optional[str] = None,
+    cache_dir: Optional[Union[str, pathlib.Path]] = None,
+) -> Optional[pathlib.Path]:
+    """The cached copy of a url (see ``cached_download``), without downloading.
+
+    Returns None if the url (or a file with the expected sha256) is not
+    cached.
+    """
+    cache_dir = pathlib.Path(cache_dir or get_cache_dir("assets"))
+    sha256 = sha256.lower() if sha256 else None
+    url_hash, suffix = _url_key(url)
+
+    if sha256 is not None:
+        path = cache_dir / f"{sha256}{suffix}"
+        if path.exists():
+            return path
+
+    index_path = cache_dir / f"{url_hash}.url.json"
+    if index_path.exists():
+        with open(index_path) as f:
+            digest = json.load(f)["sha256"]
+        path = cache_dir / f"{digest}{suffix}"
+        if path.exists() and sha256 in (None, digest):
+            return path
+
+    return None
+
+
+def _url_key(url: str) -> Tuple[str, str]:
+    """The cache key and file suffix of a url."""
+    url_hash = hashlib.sha256(url.encode()).hexdigest()[:32]
+    suffix = pathlib.PurePosixPath(urllib.parse.urlparse(url).path).suffix
+    return url_hash, suffix
+
+
+def _download_chunked(
+    url: str,
+    fname: pathlib.Path,
+    parallel_chunks: int,
+    chunk_size: int,
+    desc: str,
+    timeout: float = 30.0,
+    min_range_size: int = 8 * 1024 * 1024,
+) -> None:
+    """Download ``url`` to ``fname`` as byte ranges fetched concurrently.
+
+    Falls back to a single stream if the server does not advertise range
+    support or the file is too small to be worth splitting.
+    """
+    head = requests.head(url, allow_redirects=True, timeout=timeout)
+    head.raise_for_status()
+    total = int(head.headers.get("content-length", 0))
+    if (
+        head.headers.get("accept-ranges", "").lower() != "bytes"
+        or total < 2 * min_range_size
+    ):
+        _download_resumable(head.url, fname, chunk_size, desc, timeout)
+        return
+
+    # Every range must come from the same version of the file
+    validator = _validator(head.headers)
+
+    n_ranges = min(parallel_chunks, total // min_range_size)
+    bounds = [total * i // n_ranges for i in range(n_ranges + 1)]
+    lock = threading.Lock()
+
+    with open(fname, "wb") as file:
+        file.truncate(total)
+
+    def fetch(start: int, end: int, bar: tqdm) -> None:
+        headers = {"Range": f"bytes={start}-{end - 1}"}
+        if validator is not None:
+            headers["If-Range"] = validator
+        resp = requests.get(
+            head.url, stream=True, headers=headers, timeout=timeout
+        )
+        resp.raise_for_status()
+        if resp.status_code != 206:
+            raise IOError(
+                f"{url} changed during the download or does not honour "
+                "range requests"
+            )
+
+        with open(fname, "r+b") as file:
+            file.seek(start)
+            for data in resp.iter_content(chunk_size=chunk_size):
+                file.write(data)
+                with lock:
+                    bar.update(len(data))
+
+    try:
+        with tqdm(
+            desc=desc,
+            total=total,
+            unit="iB",
+            unit_scale=True,
+            unit_divisor=1024,
+        ) as bar, ThreadPoolExecutor(n_ranges) as executor:
+            futures = [
+                executor.submit(fetch, start, end, bar)
+                for start, end in zip(bounds[:-1], bounds[1:])
+            ]
+            for future in futures:
+                future.result()
+    except BaseException:
+        # The file has holes, so it cannot be resumed
+        fname.unlink()
+        raise
+
+
+def _download_resumable(
+    url: str,
+    fname: pathlib.Path,
+    chunk_size: int,
+    desc: str,
+    timeout: float = 30.0,
+) -> None:
+    """Download ``url`` to ``fname``, continuing a partial file if possible.
+
+    The ETag (or Last-Modified date) of the response that started the file is
+    stored next to it, and sent as ``If-Range`` when resuming, so that the
+    server sends the whole file again if it changed in between. A partial
+    file without a stored validator is downloaded again from the start.
+    """
+    validator_path = _validator_path(fname)
+    offset = fname.stat().st_size if fname.exists() else 0
+    headers = {}
+    if offset and validator_path.exists():
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = validator_path.read_text()
+    else:
+        offset = 0
+
+    resp = requests.get(url, stream=True, headers=headers, timeout=timeout)
+    if resp.status_code == 416:
+        resp.close()
+        # "Content-Range: bytes */<size>" gives the size of the file
+        size = resp.headers.get("content-range", "").rpartition("/")[2]
+        if size == str(offset):
+            # The partial file is already complete
+            validator_path.unlink(missing_ok=True)
+            return
+
+        # The partial file is longer than the file, start over
+        fname.unlink()
+        validator_path.unlink(missing_ok=True)
+        _download_resumable(url, fname, chunk_size, desc, timeout)
+        return
+    resp.raise_for_status()
+
+    if resp.status_code != 206:
+        # The server ignored the range or the file changed, start over
+        offset = 0
+        validator = _validator(resp.headers)
+        if validator is not None:
+            validator_path.write_text(validator)
+        else:
+            validator_path.unlink(missing_ok=True)
+
+    total = int(resp.headers.get("content-length", 0)) + offset
+    with open(fname, "ab" if offset else "wb") as file, tqdm(
+        desc=desc,
+        total=total,
+        initial=offset,
+        unit="iB",
+        unit_scale=True,
+        unit_divisor=1024,
+    ) as bar:
+        for data in resp.iter_content(chunk_size=chunk_size):
+            size = file.write(data)
+            bar.update(size)
+
+    validator_path.unlink(missing_ok=True)
+
+
+def _validator_path(fname: pathlib.Path) -> pathlib.Path:
+    """The file storing the ``If-Range`` validator of a partial download."""
+    return fname.with_name(fname.name + ".etag")
+
+
+def _validator(headers: Mapping[str, str]) -> Optional[str]:
+    """The strong ETag, or else the Last-Modified date, of a response."""
+    etag = headers.get("etag")
+    if etag is not None and not etag.startswith("W/"):
+        return etag
+    return headers.get("last-modified")
+
+
+class FileLock:
+    """An exclusive inter-process lock held on a lock file."""
+
+    def __init__(self, path: pathlib.Path, poll_interval: float = 0.1) -> None:
+        self.path = path
+        self.poll_interval = poll_interval
+        self._fd: Optional[int] = None
+
+    def __enter__(self) -> "FileLock":
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT)
+        if os.name == "nt":
+            import msvcrt
+
+            while True:
+                try:
+                    msvcrt.locking(self._fd, msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(self.poll_interval)
+        else:
+            import fcntl
+
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if os.name == "nt":
+            import msvcrt
+
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+        os.close(self._fd)
+        self._fd = None
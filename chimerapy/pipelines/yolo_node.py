@@ -1,10 +1,26 @@
-from typing import Dict, List, Literal, Optional
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Union,
+)
 
 import cv2
-import imutils
+import numpy as np
 
 import chimerapy.engine as cpe
 from chimerapy.orchestrator import step_node
+from chimerapy.pipelines.generic_nodes.buffer_pool import (
+    FrameBufferPool,
+    resize_dims,
+)
+from chimerapy.pipelines.model_store import ModelStore
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Reference: https://tech.amikelive.com/node-718/what-object-categories-labels-are-in-coco-dataset/
 COCO_ORIGINAL_NAMES = [
@@ -90,9 +106,95 @@ COCO_ORIGINAL_NAMES = [
     "toothbrush",
 ]
 
+DETECTION_DTYPE = np.dtype(
+    [
+        ("xmin", np.float32),
+        ("ymin", np.float32),
+        ("xmax", np.float32),
+        ("ymax", np.float32),
+        ("confidence", np.float32),
+        ("class", np.int32),
+        ("name", "U32"),
+        ("source", "U64"),
+    ]
+)
+
+
+def detections_array(
+    xyxy: np.ndarray, names: Union[Sequence[str], Dict[int, str]], source: str
+) -> np.ndarray:
+    """Convert a (N, 6) xyxy, confidence, class array to a structured array.
+
+    Parameters
+    ----------
+    xyxy : np.ndarray
+        The detections of one image, as returned in ``results.xyxy``
+    names : Sequence[str] or Dict[int, str]
+        The class names of the model, indexed by class
+    source : str
+        The name of the source of the image
+
+    Returns
+    -------
+    np.ndarray
+        A structured array of DETECTION_DTYPE, with one row per detection
+    """
+    if isinstance(names, dict):
+        names = [names[i] for i in sorted(names)]
+
+    arr = np.empty(len(xyxy), dtype=DETECTION_DTYPE)
+    arr["xmin"], arr["ymin"], arr["xmax"], arr["ymax"] = xyxy[:, :4].T
+    arr["confidence"] = xyxy[:, 4]
+    arr["class"] = xyxy[:, 5]
+    arr["name"] = np.asarray(names, dtype="U32")[arr["class"]]
+    arr["source"] = source
+    return arr
+
+
+def detections_to_dataframe(detections: np.ndarray) -> "pd.DataFrame":
+    """View the detections as a DataFrame, like ``results.pandas().xyxy``."""
+    import pandas as pd
+
+    return pd.DataFrame(detections)
+
 
 @step_node
 class YOLONode(cpe.Node):
+    """A node that detects objects in a batch of frames with YOLOv5.
+
+    Parameters
+    ----------
+    name: str, required
+        The name of the node
+    weights: str, optional (default: "yolov5s")
+        The name of the YOLOv5 weights, or a local path. The weights and the
+        YOLOv5 code are installed once in the model store and then loaded
+        without network access
+    weights_sha256: str, optional (default: None)
+        The expected sha256 of the weights, see ``ModelStore``
+    classes: List[str], optional (default: None)
+        The COCO classes to detect, all classes if None
+    per_row_display: int, optional (default: 2)
+        The number of renders per row of the tiled image
+    render: bool, optional (default: True)
+        Whether to emit the image of each input with its detections drawn
+        under ``render-<i>``
+    tile: bool, optional (default: True)
+        Whether to emit the rendered images tiled in one image under ``tiled``
+    tile_width: int, optional (default: 400)
+        The width of a tile. The tile height follows the aspect ratio of the
+        first input
+    frames_key: str, optional (default: "frame")
+        The key of the frames in the data chunks
+    emit_pandas: bool, optional (default: False)
+        If True, also emit the detections of each input as a DataFrame under
+        ``xyx-<i>``. The detections are always emitted as a structured array
+        (see ``DETECTION_DTYPE``) under ``detections-<i>``, which
+        ``detections_to_dataframe`` converts on demand
+    debug: Literal["step", "stream"], optional (default: None)
+        The debug mode of the node
+    """
+
     def __init__(
         self,
         name: str,
@@ -100,6 +202,12 @@ class YOLONode(cpe.Node):
         per_row_display=2,
         frames_key: str = "frame",
         debug: Literal["step", "stream"] = None,
+        emit_pandas: bool = False,
+        render: bool = True,
+        tile: bool = True,
+        tile_width: int = 400,
+        weights: str = "yolov5s",
+        weights_sha256: Optional[str] = None,
     ):
         # Obtain the index of the object in the original list of classes
         self.interested_classes_idx = []
@@ -108,8 +216,16 @@ class YOLONode(cpe.Node):
                 class_index = COCO_ORIGINAL_NAMES.index(obj_class)
                 self.interested_classes_idx.append(class_index)
 
+        self.weights = weights
+        self.weights_sha256 = weights_sha256
         self.per_row_display = per_row_display
         self.frames_key = frames_key
+        self.emit_pandas = emit_pandas
+        self.render = render
+        self.tile = tile
+        self.tile_width = tile_width
+        self.tile_height: Optional[int] = None
+        self.canvas_pool = FrameBufferPool(size=4)
         self.debug = debug
         super().__init__(name=name)
 
@@ -117,8 +233,14 @@ class YOLONode(cpe.Node):
         # Create the YOLOv5 model
         import torch
 
-        self.model = torch.hub.load(
-            "ultralytics/yolov5", "yolov5s", trust_repo=True
+        store = ModelStore(logger=self.logger)
+        repo = store.repo("yolov5")
+        weights = store.weights(self.weights, sha256=self.weights_sha256)
+        self.model = store.load(
+            self.weights,
+            lambda: torch.hub.load(
+                str(repo), "custom", path=str(weights), source="local"
+            ),
         )
 
         # Select only the interested classes
@@ -135,25 +257,48 @@ class YOLONode(cpe.Node):
         results = self.model(imgs)
 
         # Get the rendered image
-        renders = results.render()
+        renders = results.render() if self.render or self.tile else None
         data_chunk = cpe.DataChunk()
 
-        for i, name in enumerate(data_chunks):  # noqa: B007
-            data_chunk.add(f"xyx-{i}", results.pandas().xyxy[i])
-            data_chunk.add(f"render-{i}", renders[i], "image")
-
-        im_list_2d = []
-        for i in range(len(renders), 0, -1 * self.per_row_display):
-            im_list_2d.append(
-                [
-                    imutils.resize(renders[i - (j + 1)], width=400)
-                    for j in range(self.per_row_display)
-                ]
+        for i, name in enumerate(data_chunks):
+            detections = detections_array(
+                results.xyxy[i].cpu().numpy(), results.names, name
             )
+            data_chunk.add(f"detections-{i}", detections)
+            if self.emit_pandas:
+                data_chunk.add(f"xyx-{i}", detections_to_dataframe(detections))
+            if self.render:
+                data_chunk.add(f"render-{i}", renders[i], "image")
+
+        if self.tile:
+            data_chunk.add("tiled", self.tile_renders(renders), "image")
 
-        im_tiles = self.concat_tiles(im_list_2d)
-        data_chunk.add("tiled", im_tiles, "image")
         return data_chunk
 
-    def concat_tiles(self, im_list_2d):
-        return cv2.vconcat([cv2.hconcat(im_list_h) for im_list_h in im_list_2d])
+    def tile_renders(self, renders: List[np.ndarray]) -> np.ndarray:
+        """Draw the renders, in input order, into a pooled tiling canvas."""
+        if self.tile_height is None:
+            _, self.tile_height = resize_dims(
+                renders[0].shape, self.tile_width, None
+            )
+        tile_w, tile_h = self.tile_width, self.tile_height
+
+        cols = self.per_row_display
+        rows = -(-len(renders) // cols)
+        canvas = self.canvas_pool.acquire((rows * tile_h, cols * tile_w, 3))
+
+        for i, render in enumerate(renders):
+            row, col = divmod(i, cols)
+            cv2.resize(
+                render,
+                (tile_w, tile_h),
+                dst=canvas[
+                    row * tile_h : (row + 1) * tile_h,
+                    col * tile_w : (col + 1) * tile_w,
+                ],
+            )
+
+        # Blank the unused tiles of the last row
+        used = len(renders) - (rows - 1) * cols
+        canvas[(rows - 1) * tile_h :, used * tile_w :] = 0
+        return canvas
@@ -1,20 +1,280 @@
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Optional
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
+import cv2
 import numpy as np
 
 if TYPE_CHECKING:
+    import pandas as pd
     from ultralytics.yolo.engine.results import Results
 
+# The COCO keypoint pairs joined when plotting poses
+POSE_SKELETON = [
+    (15, 13), (13, 11), (16, 14), (14, 12), (11, 12), (5, 11), (6, 12),
+    (5, 6), (5, 7), (6, 8), (7, 9), (8, 10), (1, 2), (0, 1), (0, 2),
+    (1, 3), (2, 4), (3, 5), (4, 6),
+]  # fmt: skip
+
+
+class YOLOResult:
+    """The predictions of a YOLOv8 model for one frame, as plain arrays.
+
+    A compact, picklable alternative to the ultralytics ``Results``, which
+    also carries tensors, the original image and model metadata.
+
+    Parameters
+    ----------
+    boxes : np.ndarray
+        The (N, 4) xyxy boxes, in pixels
+    scores : np.ndarray
+        The (N,) confidences
+    classes : np.ndarray
+        The (N,) class ids
+    names : Dict[int, str]
+        The class names of the model
+    orig_shape : Tuple[int, int]
+        The (height, width) of the frame
+    keypoints : np.ndarray, optional
+        The (N, K, 3) x, y, visibility keypoints of pose models
+    segments : List[np.ndarray], optional
+        The (M, 2) xy polygon of the mask of every box, for segmentation models
+    """
+
+    __slots__ = (
+        "boxes",
+        "scores",
+        "classes",
+        "names",
+        "orig_shape",
+        "keypoints",
+        "segments",
+    )
+
+    def __init__(
+        self,
+        boxes: np.ndarray,
+        scores: np.ndarray,
+        classes: np.ndarray,
+        names: Dict[int, str],
+        orig_shape: Tuple[int, int],
+        keypoints: Optional[np.ndarray] = None,
+        segments: Optional[List[np.ndarray]] = None,
+    ) -> None:
+        self.boxes = boxes
+        self.scores = scores
+        self.classes = classes
+        self.names = names
+        self.orig_shape = orig_shape
+        self.keypoints = keypoints
+        self.segments = segments
+
+    @classmethod
+    def from_results(
+        cls, results: "Results", include_masks: bool = True
+    ) -> "YOLOResult":
+        """Copy the predictions out of an ultralytics ``Results``."""
+        data = results.boxes.data.cpu().numpy()
+        keypoints = None
+        if results.keypoints is not None:
+            keypoints = results.keypoints.data.cpu().numpy().astype(np.float32)
+        segments = None
+        if include_masks and results.masks is not None:
+            segments = [xy.astype(np.float32) for xy in results.masks.xy]
+
+        return cls(
+            boxes=data[:, :4].astype(np.float32),
+            scores=data[:, 4].astype(np.float32),
+            classes=data[:, 5].astype(np.int32),
+            names=results.names,
+            orig_shape=tuple(results.orig_shape),
+            keypoints=keypoints,
+            segments=segments,
+        )
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def __repr__(self) -> str:
+        return f"<YOLOResult {len(self)} detections>"
+
+    def plot(self, img: np.ndarray, kpt_thresh: float = 0.5) -> np.ndarray:
+        """Draw the predictions on a copy of the frame."""
+        img = img.copy()
+        for i, (x1, y1, x2, y2) in enumerate(self.boxes.astype(int)):
+            color = _class_color(int(self.classes[i]))
+            if self.segments is not None and len(self.segments[i]):
+                cv2.polylines(
+                    img, [self.segments[i].astype(np.int32)], True, color, 2
+                )
+            cv2.rectangle(img, (x1, y1), (x2, y2), color, 2)
+            label = f"{self.names[int(self.classes[i])]} {self.scores[i]:.2f}"
+            cv2.putText(
+                img,
+                label,
+                (x1, max(y1 - 4, 12)),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.5,
+                color,
+                1,
+            )
+
+        if self.keypoints is not None:
+            for kpts in self.keypoints:
+                visible = kpts[:, 2] >= kpt_thresh
+                xy = kpts[:, :2].astype(int)
+                for a, b in POSE_SKELETON:
+                    if b < len(kpts) and visible[a] and visible[b]:
+                        cv2.line(
+                            img, tuple(xy[a]), tuple(xy[b]), (255, 128, 0), 2
+                        )
+                for x, y in xy[visible]:
+                    cv2.circle(img, (x, y), 3, (0, 0, 255), -1)
+
+        return img
+
+    def to_dataframe(
+        self, frame_count: int, normalize: bool = False
+    ) -> "pd.DataFrame":
+        """The predictions as rows, in the layout of MultiSaveNode's tables."""
+        return columns_to_dataframe(
+            results_to_columns([self], [frame_count], normalize)
+        )
+
+
+def results_to_columns(
+    results: Sequence[Union["Results", YOLOResult]],
+    frame_counts: Sequence[int],
+    normalize: bool = False,
+) -> Dict[str, Any]:
+    """Convert the results of a batch of frames to columns, in one pass.
+
+    Parameters
+    ----------
+    results : Sequence[Results or YOLOResult]
+        The results of every frame
+    frame_counts : Sequence[int]
+        The frame count of every frame
+    normalize : bool, optional (default: False)
+        Whether to divide coordinates by the frame width and height
+
+    Returns
+    -------
+    Dict[str, Any]
+        The ``frame_count``, ``name``, ``class`` and ``confidence`` columns,
+        the (N, 4) ``box`` array, and when predicted, the (N, 3, K) x, y,
+        visibility ``keypoints`` array and the ``segments`` list of (2, M)
+        x, y arrays
+    """
+    results = [
+        r if isinstance(r, YOLOResult) else YOLOResult.from_results(r)
+        for r in results
+    ]
+    counts = [len(r) for r in results]
+    n_rows = sum(counts)
+
+    scale = np.ones((n_rows, 2), dtype=np.float32)
+    if normalize and n_rows:
+        scale = np.repeat(
+            np.array([r.orig_shape[::-1] for r in results], dtype=np.float32),
+            counts,
+            axis=0,
+        )
+
+    classes = _concat([r.classes for r in results], (0,), np.int32)
+    names = results[0].names if results else {}
+    name_table = np.array(
+        [names.get(i, str(i)) for i in range(max(names, default=-1) + 1)],
+        dtype=object,
+    )
+
+    columns: Dict[str, Any] = {
+        "frame_count": np.repeat(np.asarray(frame_counts, np.int64), counts),
+        "name": name_table[classes] if n_rows else np.empty(0, dtype=object),
+        "class": classes,
+        "confidence": _concat([r.scores for r in results], (0,), np.float32),
+        "box": _concat([r.boxes for r in results], (0, 4), np.float32)
+        / np.tile(scale, 2),
+    }
+
+    if any(r.keypoints is not None for r in results):
+        kpts = _concat([r.keypoints for r in results], None, np.float32)
+        kpts[..., :2] /= scale[:, None, :]
+        columns["keypoints"] = kpts.transpose(0, 2, 1)
+
+    if any(r.segments is not None for r in results):
+        columns["segments"] = [
+            (segment / scale[i]).T
+            for i, segment in enumerate(
+                segment for r in results for segment in (r.segments or [])
+            )
+        ]
+
+    return columns
+
+
+def columns_to_dataframe(columns: Dict[str, Any]) -> "pd.DataFrame":
+    """A DataFrame with one row per detection, array cells for the arrays."""
+    import pandas as pd
+
+    return pd.DataFrame(
+        {
+            key: list(value)
+            if isinstance(value, np.ndarray) and value.ndim > 1
+            else value
+            for key, value in columns.items()
+        }
+    )
+
+
+def _concat(
+    arrays: List[Optional[np.ndarray]],
+    empty_shape: Optional[Tuple[int, ...]],
+    dtype: np.dtype,
+) -> np.ndarray:
+    arrays = [a for a in arrays if a is not None]
+    if not arrays:
+        return np.empty(empty_shape or (0,), dtype=dtype)
+    return np.concatenate(arrays).astype(dtype, copy=False)
+
+
+@lru_cache(maxsize=None)
+def _class_color(cls: int) -> Tuple[int, int, int]:
+    """A stable color per class id."""
+    hue = (cls * 47) % 180
+    hsv = np.array([[[hue, 200, 255]]], dtype=np.uint8)
+    return tuple(int(c) for c in cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)[0, 0])
+
 
 @dataclass
 class YOLOFrame:
-    """A frame from a video source."""
+    """A frame from a video source, captured at ``timestamp``.
+
+    ``result`` is either the ultralytics ``Results`` (in which case ``arr`` is
+    usually already annotated) or a compact ``YOLOResult`` drawn on demand by
+    ``annotated``.
+    """
 
     arr: np.ndarray
     frame_count: int
     src_id: str
-    result: Optional["Results"] = None
+    result: Optional[Union["Results", YOLOResult]] = None
+    timestamp: Optional[float] = None
+
+    def annotated(self) -> np.ndarray:
+        """The frame with its predictions drawn."""
+        if isinstance(self.result, YOLOResult):
+            return self.result.plot(self.arr)
+        return self.arr
 
     def __repr__(self) -> str:
         return f"<Frame from {self.src_id} {self.frame_count}>"
@@ -10,7 +10,10 @@ from .data import YOLOFrame
 
 @sink_node(name="CPPipelines_YoloDisplayNode")
 class DisplayNode(cpe.Node):
-    """A node that display results after applying the YOLO model."""
+    """A node that display results after applying the YOLO model.
+
+    Compact results (see YoloV8Node's compact_results) are drawn here.
+    """
 
     def __init__(
         self,
@@ -24,7 +27,7 @@ class DisplayNode(cpe.Node):
         for _, data_chunk in data_chunks.items():
             frames: List[YOLOFrame] = data_chunk.get(self.frames_key)["value"]
             for frame in frames:
-                cv2.imshow(frame.src_id, frame.arr)
+                cv2.imshow(frame.src_id, frame.annotated())
                 cv2.waitKey(1)
 
     def teardown(self) -> None:
@@ -1,12 +1,16 @@
-from typing import Dict, List
-
-import numpy as np
-import pandas as pd
+from typing import Dict, List, Literal, Optional, Union
 
 import chimerapy.engine as cpe
 from chimerapy.orchestrator import sink_node
+from chimerapy.pipelines.generic_nodes.recording import on_recording_stopped
+from chimerapy.pipelines.generic_nodes.table_writer import (
+    ArrowFileSink,
+    BufferedTableWriter,
+    CSVFileSink,
+)
+from chimerapy.pipelines.generic_nodes.video_writer import AsyncVideoWriter
 
-from .data import YOLOFrame
+from .data import YOLOFrame, columns_to_dataframe, results_to_columns
 
 
 def to_dataframe(results, frame_cnt, normalize=False):
@@ -14,43 +18,9 @@ def to_dataframe(results, frame_cnt, normalize=False):
     Helper function to save results as pandas df
     Code adapted from method tojson() from YOLOv8 repo results.py
     """
-    lst = []
-    data = results.boxes.data.cpu().tolist()
-    h, w = results.orig_shape if normalize else (1, 1)
-    for i, row in enumerate(data):
-        box = np.array([row[0] / w, row[1] / h, row[2] / w, row[3] / h])
-        conf = row[4]
-        id = int(row[5])
-        name = results.names[id]
-        result = {
-            "frame_count": frame_cnt,
-            "name": name,
-            "class": id,
-            "confidence": conf,
-            "box": box,
-        }
-        if results.masks:
-            xy = results.masks.xy[i]
-            result["segments"] = np.array(
-                [
-                    (xy[:, 0] / w).tolist(),
-                    (xy[:, 1] / h).tolist(),
-                ]
-            )
-        if results.keypoints is not None:
-            x, y, visible = (
-                results.keypoints[i].data[0].cpu().unbind(dim=1)
-            )  # torch Tensor
-            result["keypoints"] = np.array(
-                [
-                    (x / w).tolist(),
-                    (y / h).tolist(),
-                    visible.tolist(),
-                ]
-            )
-        lst.append(result)
-
-    return pd.DataFrame(lst)
+    return columns_to_dataframe(
+        results_to_columns([results], [frame_cnt], normalize)
+    )
 
 
 @sink_node(name="CPPipelines_YoloMultiSaveNode")
@@ -68,10 +38,18 @@ class MultiSaveNode(cpe.Node):
     filename: str, optional (default: 'yolo_results')
         The name of the file that results will be saved to
     file_format: str, optional (default: 'df')
-        The format that results will be saved as. Two option available
-        video (mp4, param: vid) and table (csv, param: df)
-    fps: int, optional (default: 30)
-        Video fps that can be manually set
+        The format that results will be saved as. Available options are
+        video (mp4, param: vid), table (csv, param: df), and with pyarrow
+        installed, parquet (param: parquet) and Arrow IPC (param: arrow)
+    fps: int, optional (default: None)
+        Video fps that can be manually set. If None, it is measured from the
+        rate at which frames arrive
+    flush_rows: int, optional (default: 5000)
+        Table rows are buffered and written together once this many rows are
+        buffered
+    flush_interval: float, optional (default: 5.0)
+        The maximum time, in seconds, table rows are buffered before being
+        written. Buffered rows are also written when the node stops
     """
 
     def __init__(
@@ -80,39 +58,101 @@ class MultiSaveNode(cpe.Node):
         frames_key: str = "frame",
         name: str = "SaveNode",
         filename: str = "yolo_results",
-        file_format: str = "df",
-        fps: int = 30,
+        file_format: Literal["df", "vid", "parquet", "arrow"] = "df",
+        fps: Optional[int] = None,
+        flush_rows: int = 5000,
+        flush_interval: float = 5.0,
     ) -> None:
         self.source_key = source_key
         self.frames_key = frames_key
         self.format = file_format
         self.filename = filename
         self.fps = fps
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.video_writer: Optional[AsyncVideoWriter] = None
+        self.table_writers: Dict[str, BufferedTableWriter] = {}
+        self.file_sinks: List[Union[ArrowFileSink, CSVFileSink]] = []
         super().__init__(name=name)
 
+    def setup(self) -> None:
+        if "vid" == self.format:
+            self.video_writer = AsyncVideoWriter.for_node(self)
+        else:
+            on_recording_stopped(self, self.stop_recording)
+
     def step(self, data_chunks: Dict[str, cpe.DataChunk]) -> None:
         for _, data_chunk in data_chunks.items():
             frames: List[YOLOFrame] = data_chunk.get(self.frames_key)["value"]
-            for frame in frames:
-                if self.source_key == frame.src_id:
-                    if "df" == self.format:
-                        results = frame.result
-                        frame_cnt = frame.frame_count
-                        if results:
-                            dfs = [
-                                to_dataframe(result, frame_cnt)
-                                for result in results
-                            ]
-                            df = pd.concat(dfs, ignore_index=True)
-                            self.save_tabular(
-                                self.filename + "-" + frame.src_id, df
-                            )
-
-                    elif "vid" == self.format:
-                        img = frame.arr
-                        if img.size > 0:
-                            self.save_video(
-                                self.filename + "-" + frame.src_id,
-                                img,
-                                self.fps,
-                            )
+            frames = [
+                frame for frame in frames if self.source_key == frame.src_id
+            ]
+            if not frames:
+                continue
+
+            if "vid" == self.format:
+                if self.video_writer is None:
+                    continue
+                for frame in frames:
+                    img = frame.annotated()
+                    if img.size > 0:
+                        self.video_writer.submit(
+                            self.filename + "-" + frame.src_id,
+                            img,
+                            self.fps,
+                            frame.timestamp,
+                        )
+            else:
+                frames = [frame for frame in frames if frame.result]
+                if (
+                    frames
+                    and self.recorder is not None
+                    and self.recorder.enabled
+                ):
+                    # Convert the whole batch of frames at once
+                    self._get_table_writer(self.source_key).append(
+                        results_to_columns(
+                            [frame.result for frame in frames],
+                            [frame.frame_count for frame in frames],
+                        )
+                    )
+
+    def _get_table_writer(self, src_id: str) -> BufferedTableWriter:
+        if src_id not in self.table_writers:
+            name = self.filename + "-" + src_id
+            if "df" == self.format:
+                sink = CSVFileSink(
+                    self.state.logdir / f"{name}.csv", columns_to_dataframe
+                )
+            else:
+                sink = ArrowFileSink(
+                    self.state.logdir / f"{name}.{self.format}", self.format
+                )
+            self.file_sinks.append(sink)
+
+            self.table_writers[src_id] = BufferedTableWriter(
+                sink.write, self.flush_rows, self.flush_interval
+            )
+        return self.table_writers[src_id]
+
+    def stop_recording(self) -> None:
+        """Write the buffered rows and close the result files.
+
+        Called when the node stops, before the engine collects its log
+        directory.
+        """
+        for table_writer in self.table_writers.values():
+            table_writer.close()
+        for sink in self.file_sinks:
+            sink.close()
+        self.table_writers.clear()
+        self.file_sinks.clear()
+
+    def teardown(self) -> None:
+        self.stop_recording()
+
+        if self.video_writer is not None:
+            self.video_writer.close()
+            self.logger.info(
+                f"{self}: video writer stats {self.video_writer.stats()}"
+            )
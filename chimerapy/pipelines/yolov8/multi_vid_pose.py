@@ -2,8 +2,9 @@ from typing import Dict, List, Literal, Optional
 
 import chimerapy.engine as cpe
 from chimerapy.orchestrator import step_node
+from chimerapy.pipelines.model_store import ModelStore
 
-from .data import YOLOFrame
+from .data import YOLOFrame, YOLOResult
 
 COCO_ORIGINAL_NAMES = [
     "person",
@@ -117,6 +118,23 @@ class YoloV8Node(cpe.Node):
 
     classes: list, optional (default: ['person'])
         The classes to be detected by the model.
+
+    weights_sha256: str, optional (default: None)
+        The expected sha256 of the weights. The weights are installed once in
+        the model store and then loaded without network access.
+
+    max_batch_size: int, optional (default: 16)
+        The maximum number of frames passed to the model at once. The frames
+        of all inputs are predicted together, in batches of at most this size.
+
+    compact_results: bool, optional (default: False)
+        If True, emit the original frames with a compact, array-backed
+        YOLOResult instead of the plotted frames with the ultralytics Results.
+        Sinks draw the predictions only if they need an annotated image.
+
+    include_masks: bool, optional (default: True)
+        Whether compact results include the mask polygons of segmentation
+        models.
     """
 
     def __init__(
@@ -127,6 +145,10 @@ class YoloV8Node(cpe.Node):
         device: Literal["cpu", "cuda"] = "cpu",
         frames_key: str = "frame",
         classes: Optional[List[str]] = None,
+        weights_sha256: Optional[str] = None,
+        max_batch_size: int = 16,
+        compact_results: bool = False,
+        include_masks: bool = True,
     ):
 
         if classes is None:
@@ -136,6 +158,10 @@ class YoloV8Node(cpe.Node):
         self.scale = scale
         self.device = device if device == "cpu" else 0
         self.frames_key = frames_key
+        self.weights_sha256 = weights_sha256
+        self.max_batch_size = max_batch_size
+        self.compact_results = compact_results
+        self.include_masks = include_masks
         # adapted from yolo_node.py
         self.classes_idx = []
         if classes:
@@ -151,31 +177,46 @@ class YoloV8Node(cpe.Node):
 
         # load model according to params
         if self.task:
-            self.model = YOLO(f"yolov8{self.scale}-{self.task}.pt")
+            model_name = f"yolov8{self.scale}-{self.task}"
         else:
-            self.model = YOLO(f"yolov8{self.scale}.pt")
+            model_name = f"yolov8{self.scale}"
+
+        store = ModelStore(logger=self.logger)
+        weights = store.weights(model_name, sha256=self.weights_sha256)
+        self.model = store.load(model_name, lambda: YOLO(str(weights)))
 
     def step(self, data_chunks: Dict[str, cpe.DataChunk]) -> cpe.DataChunk:
         # Aggregate all inputs
         ret_chunk = cpe.DataChunk()
-        ret_frames = []
+        frames: List[YOLOFrame] = []
         for _, data_chunk in data_chunks.items():  # noqa: B007
-            frames: List[YOLOFrame] = data_chunk.get(self.frames_key)["value"]
-            for frame in frames:
-                img = frame.arr
-                # disable verbose output and select interested classes
-                result = self.model(
-                    img,
-                    device=self.device,
-                    verbose=False,
-                    classes=self.classes_idx,
-                )[0]
-                # pass down both the rendered result image and the numerical results
+            frames.extend(data_chunk.get(self.frames_key)["value"])
+
+        ret_frames = []
+        for start in range(0, len(frames), self.max_batch_size):
+            batch = frames[start : start + self.max_batch_size]
+            # disable verbose output and select interested classes
+            results = self.model(
+                [frame.arr for frame in batch],
+                device=self.device,
+                verbose=False,
+                classes=self.classes_idx,
+            )
+            # results are in the order of the batch
+            for frame, result in zip(batch, results):
+                if self.compact_results:
+                    # pass down the original image, plotting is left to sinks
+                    arr = frame.arr
+                    result = YOLOResult.from_results(result, self.include_masks)
+                else:
+                    # pass down both the rendered result image and the numerical results
+                    arr = result.plot()
                 new_frame = YOLOFrame(
-                    arr=result.plot(),
+                    arr=arr,
                     frame_count=frame.frame_count,
                     src_id=frame.src_id,
                     result=result,
+                    timestamp=frame.timestamp,
                 )
                 ret_frames.append(new_frame)
 
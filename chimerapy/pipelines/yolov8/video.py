@@ -1,3 +1,5 @@
+from typing import Optional
+
 import chimerapy.engine as cpe
 from chimerapy.orchestrator import source_node
 from chimerapy.pipelines.generic_nodes.video_nodes import Video
@@ -7,22 +9,47 @@ from .data import YOLOFrame
 
 @source_node(name="CPPipelines_YOLOVideo")
 class YOLOVideo(Video):
-    """A video node that returns a Frame object with identifiable metadata."""
+    """A video node that returns a Frame object with identifiable metadata.
+
+    Parameters
+    ----------
+    batch_size: int, optional (default: 1)
+        The maximum number of frames emitted together in one data chunk
+    batch_timeout_ms: float, optional (default: None)
+        If provided, emit a partial batch once this many milliseconds have
+        elapsed since its first frame
+    *args, **kwargs
+        Arguments passed to the Video node
+    """
 
-    def __init__(self, *args, **kwargs) -> None:
+    def __init__(
+        self,
+        *args,
+        batch_size: int = 1,
+        batch_timeout_ms: Optional[float] = None,
+        **kwargs,
+    ) -> None:
         super().__init__(*args, **kwargs)
         self.include_meta = True
+        self.batch_size = batch_size
+        self.batch_timeout_ms = batch_timeout_ms
 
     def step(self) -> cpe.DataChunk:
-        data_chunk = super().step()
         ret_chunk = cpe.DataChunk()
-        frame_arr = data_chunk.get(self.frame_key)["value"]
-        src_id = data_chunk.get("metadata")["value"]["source_name"]
-        frame_count = data_chunk.get("metadata")["value"]["frame_count"]
-
-        ret_chunk.add(
-            self.frame_key,
-            [YOLOFrame(frame_arr, src_id=src_id, frame_count=frame_count)],
-        )
+        frames = []
+        for data_chunk in self.step_batch(
+            self.batch_size, self.batch_timeout_ms
+        ):
+            meta = data_chunk.get("metadata")["value"]
+            frames.append(
+                YOLOFrame(
+                    data_chunk.get(self.frame_key)["value"],
+                    src_id=meta["source_name"],
+                    frame_count=meta["frame_count"],
+                    timestamp=meta["timestamp"],
+                )
+            )
+
+        ret_chunk.add(self.frame_key, frames)
 
         return ret_chunk
@@ -0,0 +1,50 @@
+import numpy as np
+
+# Internal Imports
+from chimerapy.pipelines.mf_sort_tracking.bbox_painter import BBoxPainter
+from chimerapy.pipelines.mf_sort_tracking.data import (
+    DetectionArray,
+    MFSortFrame,
+    MFSortTrackedDetections,
+)
+
+
+def test_paint_copies_frames():
+    arr = np.zeros((120, 160, 3), dtype=np.uint8)
+    boxes = DetectionArray([[10, 30, 20, 20], [60, 30, 20, 20]], cls=[0, 1])
+    frame = MFSortFrame(
+        arr,
+        frame_count=0,
+        src_id="test",
+        detections=[
+            MFSortTrackedDetections(tracker_id=i, bboxes=boxes[i : i + 1])
+            for i in range(len(boxes))
+        ],
+        all_boxes=boxes,
+    )
+    painter = BBoxPainter(paint_classes=[1], copy_frames=True)
+    painted = painter.paint_frames([frame])[0]
+
+    assert not arr.any()
+    assert painted.arr.any()
+    # Boxes of the painted classes are filled in
+    assert (painted.arr[35:45, 65:75] == (0, 255, 0)).all()
+    assert not painted.arr[35:45, 15:25].any()
+
+
+def test_paint_copies_shared_frames_by_default():
+    arr = np.zeros((120, 160, 3), dtype=np.uint8)
+    boxes = DetectionArray([[10, 30, 20, 20]])
+    frame = MFSortFrame(
+        arr,
+        frame_count=0,
+        src_id="test",
+        detections=[MFSortTrackedDetections(tracker_id=1, bboxes=boxes)],
+        all_boxes=boxes,
+        handle=object(),
+    )
+    painted = BBoxPainter().paint_frames([frame])[0]
+
+    assert not arr.any()
+    assert painted.arr.any()
+    assert painted.handle is None
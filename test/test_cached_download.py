@@ -0,0 +1,163 @@
+import hashlib
+import http.server
+import threading
+
+import pytest
+
+# Internal Imports
+from chimerapy.pipelines.prefetch import find_assets
+from chimerapy.pipelines.utils import (
+    ChecksumError,
+    _download_chunked,
+    _validator_path,
+    cached_download,
+)
+
+PAYLOAD = bytes(range(256)) * 1024
+
+
+class _RangeHandler(http.server.BaseHTTPRequestHandler):
+    requests = []
+    if_ranges = []
+    etag = None
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+    def do_GET(self):
+        self.requests.append(self.headers.get("Range"))
+        self.if_ranges.append(self.headers.get("If-Range"))
+        start, end = 0, len(PAYLOAD)
+        if self.headers.get("Range") and self.headers.get("If-Range") in (
+            None,
+            self.etag,
+        ):
+            first, last = self.headers["Range"].split("=")[1].split("-")
+            start, end = int(first), int(last or end - 1) + 1
+            if start >= len(PAYLOAD):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(PAYLOAD)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+        else:
+            self.send_response(200)
+        if self.etag is not None:
+            self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(end - start))
+        self.end_headers()
+        self.wfile.write(PAYLOAD[start:end])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _RangeHandler.requests = []
+    _RangeHandler.if_ranges = []
+    _RangeHandler.etag = None
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _RangeHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/weights.pt"
+    httpd.shutdown()
+
+
+def test_download_is_cached(server, tmp_path):
+    path = cached_download(server, cache_dir=tmp_path)
+    assert path.read_bytes() == PAYLOAD
+    assert path.name == hashlib.sha256(PAYLOAD).hexdigest() + ".pt"
+
+    assert cached_download(server, cache_dir=tmp_path) == path
+    assert len(_RangeHandler.requests) == 1
+
+
+def test_partial_download_without_validator_restarts(server, tmp_path):
+    path = cached_download(server, cache_dir=tmp_path)
+    part = path.with_name(
+        hashlib.sha256(server.encode()).hexdigest()[:32] + ".part"
+    )
+    part.write_bytes(b"x" * 1000)
+    path.unlink()
+
+    assert cached_download(server, cache_dir=tmp_path).read_bytes() == PAYLOAD
+    assert _RangeHandler.requests[-1] is None
+
+
+def _part_path(url, cache_dir):
+    return cache_dir / (hashlib.sha256(url.encode()).hexdigest()[:32] + ".part")
+
+
+def test_resume_is_conditional(server, tmp_path):
+    _RangeHandler.etag = '"v2"'
+    part = _part_path(server, tmp_path)
+    part.write_bytes(PAYLOAD[:1000])
+    _validator_path(part).write_text('"v2"')
+
+    path = cached_download(server, cache_dir=tmp_path)
+    assert path.read_bytes() == PAYLOAD
+    assert _RangeHandler.if_ranges[-1] == '"v2"'
+    assert not _validator_path(part).exists()
+
+    # The file changed since the partial download, so it is sent again
+    path.unlink()
+    part.write_bytes(b"x" * 1000)
+    _validator_path(part).write_text('"v1"')
+
+    assert cached_download(server, cache_dir=tmp_path).read_bytes() == PAYLOAD
+    assert _RangeHandler.requests[-1] == "bytes=1000-"
+    assert _RangeHandler.if_ranges[-1] == '"v1"'
+
+
+def test_complete_partial_file(server, tmp_path):
+    _RangeHandler.etag = '"v1"'
+    part = _part_path(server, tmp_path)
+    part.write_bytes(PAYLOAD)
+    _validator_path(part).write_text('"v1"')
+
+    assert cached_download(server, cache_dir=tmp_path).read_bytes() == PAYLOAD
+    assert _RangeHandler.requests == [f"bytes={len(PAYLOAD)}-"]
+
+
+def test_oversized_partial_file_restarts(server, tmp_path):
+    _RangeHandler.etag = '"v1"'
+    part = _part_path(server, tmp_path)
+    part.write_bytes(PAYLOAD + b"junk")
+    _validator_path(part).write_text('"v1"')
+
+    assert cached_download(server, cache_dir=tmp_path).read_bytes() == PAYLOAD
+    assert _RangeHandler.requests == [f"bytes={len(PAYLOAD) + 4}-", None]
+
+
+def test_checksum_mismatch(server, tmp_path):
+    with pytest.raises(ChecksumError):
+        cached_download(server, sha256="0" * 64, cache_dir=tmp_path)
+
+
+def test_chunked_download(server, tmp_path):
+    fname = tmp_path / "weights.pt"
+    _download_chunked(server, fname, 4, 1024, "test", min_range_size=1024)
+    assert fname.read_bytes() == PAYLOAD
+    assert len(_RangeHandler.requests) == 4
+
+
+def test_find_assets():
+    config = {
+        "nodes": [
+            {
+                "name": "video",
+                "kwargs": {"video_src": "http://a/v.mp4", "video_sha256": "ab"},
+            },
+            {"name": "other", "kwargs": {"video_src": "http://a/v.mp4"}},
+            {"name": "local", "kwargs": {"video_src": "v.mp4", "width": 1}},
+        ]
+    }
+    (asset,) = find_assets([config])
+    assert asset.url == "http://a/v.mp4"
+    assert asset.sha256 == "ab"
+    assert asset.nodes == ["video", "other"]
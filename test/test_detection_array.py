@@ -0,0 +1,42 @@
+import pickle
+
+import numpy as np
+
+# Internal Imports
+from chimerapy.pipelines.mf_sort_tracking.data import (
+    DetectionArray,
+    MFSortFrame,
+    MFSortTrackedDetections,
+)
+
+
+def test_detection_array_filtering():
+    boxes = DetectionArray(
+        [[0, 0, 10, 10], [5, 5, 10, 20], [1, 2, 3, 4]],
+        confidence=[0.9, 0.5, 0.7],
+        cls=[0, 2, 0],
+    )
+    people = boxes[boxes.cls == 0]
+    assert len(people) == 2
+    assert people.confidence.tolist() == [np.float32(0.9), np.float32(0.7)]
+    assert people.track_id.tolist() == [-1, -1]
+    assert len(boxes.with_classes([2])) == 1
+
+    # Rows are views, readable like mf_sort Detections
+    row = boxes[-1]
+    assert row.cls == 0 and row.tlwh.tolist() == [1, 2, 3, 4]
+    assert [det.cls for det in boxes] == [0, 2, 0]
+
+    restored = pickle.loads(pickle.dumps(boxes))
+    assert np.array_equal(restored.tlwh, boxes.tlwh)
+    assert len(DetectionArray.concat([boxes, people])) == 5
+
+
+def test_dataclasses_convert_detection_lists():
+    detections = list(DetectionArray([[0, 0, 10, 10]], cls=[3]))
+    tracked = MFSortTrackedDetections(tracker_id=7, bboxes=detections)
+    assert isinstance(tracked.bboxes, DetectionArray)
+    assert tracked.bboxes.track_id.tolist() == [7]
+
+    frame = MFSortFrame(arr=None, frame_count=0, src_id="a", all_boxes=[])
+    assert len(frame.all_boxes) == 0
@@ -0,0 +1,42 @@
+import numpy as np
+
+import chimerapy.engine as cpe
+
+# Internal Imports
+from chimerapy.pipelines.mf_sort_tracking.data import (
+    DetectionArray,
+    MFSortFrame,
+    MFSortTrackedDetections,
+)
+from chimerapy.pipelines.mf_sort_tracking.numpy_tracker import NumpyTracker
+from chimerapy.pipelines.mf_sort_tracking.tracker import MFSortTracker
+
+
+def test_skipped_frames_are_predicted_by_the_kalman_filters():
+    node = MFSortTracker(backend="numpy", min_hits=1)
+    node.setup()
+    reference = NumpyTracker(min_hits=1)
+
+    for f in range(8):
+        detected = f < 4 or f == 7
+        boxes = DetectionArray([[10 + 5 * f, 10, 20, 40]], [0.9], [0])
+        frame = MFSortFrame(
+            arr=None,
+            frame_count=f,
+            src_id="cam",
+            detections=[MFSortTrackedDetections(bboxes=boxes)],
+            all_boxes=boxes,
+            detected=detected,
+        )
+        chunk = cpe.DataChunk()
+        chunk.add("frame", [frame])
+        (out,) = node.step({"detector": chunk}).get("frame")["value"]
+
+        if detected:
+            expected = reference.update(boxes.tlwh, boxes.confidence, [0])[0]
+        else:
+            expected = reference.predict()
+        (track,) = out.detections
+        assert track.tracker_id == 1
+        assert track.predicted == (not detected)
+        assert np.allclose(track.bboxes.tlwh, expected, atol=1e-3)
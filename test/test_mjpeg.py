@@ -0,0 +1,57 @@
+import urllib.request
+
+import numpy as np
+import pytest
+
+# Internal Imports
+from chimerapy.pipelines.generic_nodes.mjpeg import MJPEGBroadcaster
+
+
+@pytest.fixture
+def broadcaster():
+    broadcaster = MJPEGBroadcaster(port=0, max_fps=100)
+    broadcaster.start()
+    yield broadcaster
+    broadcaster.stop()
+
+
+def _read_part(resp) -> bytes:
+    assert resp.readline().startswith(b"--")
+    headers = {}
+    while True:
+        line = resp.readline().strip()
+        if not line:
+            break
+        key, value = line.decode().split(": ")
+        headers[key] = value
+    return resp.read(int(headers["Content-Length"]))
+
+
+def test_frames_are_encoded_once_for_all_viewers(broadcaster):
+    host, port = broadcaster.address
+    broadcaster.publish("cam", np.zeros((48, 64, 3), dtype=np.uint8))
+
+    viewers = [
+        urllib.request.urlopen(f"http://{host}:{port}/stream/cam", timeout=5)
+        for _ in range(3)
+    ]
+    jpegs = [_read_part(resp) for resp in viewers]
+    for resp in viewers:
+        resp.close()
+
+    assert all(jpeg[:2] == b"\xff\xd8" for jpeg in jpegs)
+    assert broadcaster.encoded == 1
+
+
+def test_slow_viewer_gets_latest_frame(broadcaster):
+    frames = [np.full((48, 64), i * 50, dtype=np.uint8) for i in range(4)]
+    for frame in frames:
+        broadcaster.publish("cam", frame)
+
+    # A viewer that connects late only sees the latest frame
+    seq, _ = broadcaster.next_jpeg("cam", after_seq=0)
+    assert seq == len(frames)
+    assert broadcaster.encoded == 1
+
+    # No newer frame
+    assert broadcaster.next_jpeg("cam", after_seq=seq, timeout=0.2) is None
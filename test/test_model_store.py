@@ -0,0 +1,54 @@
+import http.server
+import io
+import threading
+import zipfile
+
+import pytest
+
+# Internal Imports
+from chimerapy.pipelines.model_store import ModelStore
+from chimerapy.pipelines.utils import ChecksumError
+
+
+def _zip() -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("yolov5-7.0/hubconf.py", "")
+    return buf.getvalue()
+
+
+FILES = {"/yolov5s.pt": b"weights" * 100, "/yolov5.zip": _zip()}
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = FILES[self.path]
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_installed_models_load_offline(tmp_path, monkeypatch):
+    monkeypatch.setenv("CHIMERAPY_PIPELINES_CACHE", str(tmp_path))
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{httpd.server_address[1]}"
+
+    store = ModelStore()
+    weights = store.weights("yolov5s", url=f"{base}/yolov5s.pt")
+    repo = store.repo("yolov5", url=f"{base}/yolov5.zip")
+    assert (repo / "hubconf.py").exists()
+    assert set(store.manifest()) == {"yolov5s", "yolov5"}
+
+    # No network access once installed
+    httpd.shutdown()
+    httpd.server_close()
+    assert ModelStore().weights("yolov5s") == weights
+    assert ModelStore().repo("yolov5") == repo
+
+    with pytest.raises(ChecksumError):
+        ModelStore().weights("yolov5s", sha256="0" * 64)
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+# Internal Imports
+from chimerapy.pipelines.yolov8.multi_save import MultiSaveNode
+
+
+def _columns(n):
+    return {
+        "frame_count": np.arange(n),
+        "box": np.zeros((n, 4), dtype=np.float32),
+        "name": ["person"] * n,
+    }
+
+
+@pytest.mark.parametrize("file_format", ["df", "parquet"])
+def test_buffered_rows_are_saved_when_recording_stops(tmp_path, file_format):
+    if file_format == "parquet":
+        pytest.importorskip("pyarrow")
+
+    node = MultiSaveNode(source_key="cam", file_format=file_format)
+    node.state.logdir = tmp_path
+
+    writer = node._get_table_writer("cam")
+    writer.append(_columns(3))
+    writer.append(_columns(2))
+    assert writer.rows == 5
+    assert not any(tmp_path.iterdir())
+
+    node.stop_recording()
+    if file_format == "df":
+        df = pd.read_csv(tmp_path / "yolo_results-cam.csv")
+    else:
+        df = pd.read_parquet(tmp_path / "yolo_results-cam.parquet")
+    assert df["frame_count"].tolist() == [0, 1, 2, 0, 1]
+    assert not node.table_writers
@@ -0,0 +1,36 @@
+import numpy as np
+
+# Internal Imports
+from chimerapy.pipelines.mf_sort_tracking.numpy_tracker import (
+    NumpyTracker,
+    _greedy_assignment,
+    iou_matrix,
+)
+
+
+def test_iou_matrix():
+    a = np.array([[0, 0, 10, 10], [100, 100, 10, 10]], dtype=float)
+    b = np.array([[0, 0, 10, 10], [5, 0, 10, 10]], dtype=float)
+    assert np.allclose(iou_matrix(a, b), [[1, 50 / 150], [0, 0]])
+
+
+def test_greedy_assignment():
+    cost = np.array([[0.1, 0.2], [0.05, 0.9], [0.5, 0.5]])
+    rows, cols = _greedy_assignment(cost)
+    assert sorted(zip(rows.tolist(), cols.tolist())) == [(0, 1), (1, 0)]
+
+
+def test_tracks_keep_their_ids():
+    tracker = NumpyTracker(min_hits=3)
+    for f in range(10):
+        boxes = np.array([[10 + 3 * f, 10, 20, 40], [200 - 2 * f, 50, 30, 60]])
+        tlwh, confidence, cls, ids = tracker.update(boxes, [0.9, 0.8], [0, 2])
+
+    assert ids.tolist() == [1, 2]
+    assert cls.tolist() == [0, 2]
+    assert np.allclose(tlwh, boxes, atol=1)
+
+    # Tracks without detections are dropped after max_age frames
+    for _ in range(tracker.max_age + 1):
+        assert len(tracker.update(np.zeros((0, 4)), [], [])[3]) == 0
+    assert len(tracker) == 0
@@ -0,0 +1,76 @@
+import pytest
+
+# Internal Imports
+from chimerapy.pipelines.generic_nodes.pacing import PacingClock
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_time():
+    return FakeTime()
+
+
+def test_pacing_no_drift(fake_time):
+    clock = PacingClock(10, clock=fake_time.clock, sleep=fake_time.sleep)
+
+    for _ in range(101):
+        fake_time.now += 0.03  # Simulated work per step
+        clock.wait()
+
+    # 100 intervals after the first tick, plus the work of the first step
+    assert fake_time.now == pytest.approx(10.03)
+    assert clock.late == 0
+    assert clock.dropped == 0
+
+
+def test_pacing_playback_speed(fake_time):
+    clock = PacingClock(
+        10, speed=2.0, clock=fake_time.clock, sleep=fake_time.sleep
+    )
+
+    for _ in range(21):
+        clock.wait()
+
+    assert fake_time.now == pytest.approx(1.0)
+
+
+def test_pacing_reports_late_and_dropped(fake_time):
+    clock = PacingClock(10, clock=fake_time.clock, sleep=fake_time.sleep)
+    clock.wait()
+
+    fake_time.now += 0.35  # Overrun three deadlines
+    lateness = clock.wait()
+
+    assert lateness == pytest.approx(0.25)
+    assert clock.late == 1
+    assert clock.dropped == 2
+
+    # Back on schedule at the next non-skipped deadline
+    clock.wait()
+    assert fake_time.now == pytest.approx(0.4)
+
+
+def test_pacing_catch_up(fake_time):
+    clock = PacingClock(
+        10, catch_up=True, clock=fake_time.clock, sleep=fake_time.sleep
+    )
+    clock.wait()
+
+    fake_time.now += 0.35
+    clock.wait()
+    clock.wait()
+    clock.wait()
+
+    assert fake_time.now == pytest.approx(0.35)
+    assert clock.dropped == 0
+    assert clock.late == 3
@@ -0,0 +1,84 @@
+import multiprocessing as mp
+import pickle
+
+import numpy as np
+import pytest
+
+# Internal Imports
+from chimerapy.pipelines.generic_nodes.shared_frames import (
+    SharedFrameRing,
+    StaleFrameError,
+)
+from chimerapy.pipelines.mf_sort_tracking.data import MFSortFrame
+
+
+@pytest.fixture
+def ring():
+    ring = SharedFrameRing(slots=2, slot_nbytes=480 * 640 * 3)
+    yield ring
+    ring.close()
+
+
+def _frame_sum(payload: bytes) -> int:
+    frame = pickle.loads(payload)
+    return int(frame.arr.sum())
+
+
+def test_frame_pickles_only_handle(ring):
+    arr = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+    view, handle = ring.write(arr)
+    frame = MFSortFrame(view, frame_count=0, src_id="test", handle=handle)
+
+    payload = pickle.dumps(frame)
+    assert len(payload) < 1024
+
+    restored = pickle.loads(payload)
+    assert np.array_equal(restored.arr, arr)
+
+    # Map the frame from another process
+    ctx = mp.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        assert pool.apply(_frame_sum, (payload,)) == int(arr.sum())
+
+
+def test_replaced_array_is_pickled_inline(ring):
+    arr = np.ones((480, 640, 3), dtype=np.uint8)
+    view, handle = ring.write(arr)
+    frame = MFSortFrame(
+        view.copy(), frame_count=0, src_id="test", handle=handle
+    )
+
+    restored = pickle.loads(pickle.dumps(frame))
+    assert not handle.maps(restored.arr)
+    assert np.array_equal(restored.arr, arr)
+
+
+def test_recycled_slot_is_stale(ring):
+    arr = np.zeros((480, 640, 3), dtype=np.uint8)
+    _, handle = ring.write(arr)
+    assert handle.is_current()
+
+    ring.write(arr)
+    ring.write(arr)
+    assert not handle.is_current()
+
+    with pytest.raises(StaleFrameError):
+        handle.open()
+
+
+def test_shared_views_are_read_only(ring):
+    arr = np.zeros((4, 4, 3), dtype=np.uint8)
+    view, handle = ring.write(arr)
+    frame = pickle.loads(
+        pickle.dumps(
+            MFSortFrame(view, frame_count=0, src_id="a", handle=handle)
+        )
+    )
+    assert not frame.arr.flags.writeable
+    with pytest.raises(ValueError):
+        frame.arr[0, 0] = 255
+
+    writable = frame.writable()
+    writable.arr[0, 0] = 255
+    assert writable.handle is None
+    assert not handle.open().any()
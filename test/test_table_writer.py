@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+# Internal Imports
+from chimerapy.pipelines.generic_nodes.table_writer import (
+    BufferedTableWriter,
+    CSVFileSink,
+)
+
+
+def _columns(n):
+    return {
+        "frame_count": np.arange(n),
+        "box": np.zeros((n, 4), dtype=np.float32),
+        "name": ["person"] * n,
+    }
+
+
+def test_rows_are_written_in_batches():
+    writes = []
+    writer = BufferedTableWriter(writes.append, flush_rows=5, flush_interval=60)
+
+    writer.append(_columns(2))
+    writer.append(_columns(0))
+    assert writes == []
+
+    writer.append(_columns(3))
+    assert len(writes) == 1
+    assert writes[0]["box"].shape == (5, 4)
+    assert writes[0]["name"] == ["person"] * 5
+
+    writer.append(_columns(1))
+    writer.close()
+    assert len(writes) == 2
+    assert writes[1]["frame_count"].tolist() == [0]
+
+
+def test_rows_are_written_after_interval():
+    writes = []
+    writer = BufferedTableWriter(
+        writes.append, flush_rows=100, flush_interval=0
+    )
+    writer.append(_columns(1))
+    assert len(writes) == 1
+
+
+def test_csv_sink_appends_batches(tmp_path):
+    pd = pytest.importorskip("pandas")
+
+    sink = CSVFileSink(tmp_path / "results.csv")
+    writer = BufferedTableWriter(sink.write, flush_rows=100, flush_interval=60)
+    writer.append({"frame_count": np.arange(2), "name": ["a", "b"]})
+    writer.flush()
+    writer.append({"frame_count": np.arange(1), "name": ["c"]})
+    writer.close()
+    sink.close()
+
+    df = pd.read_csv(tmp_path / "results.csv")
+    assert df["frame_count"].tolist() == [0, 1, 0]
+    assert df["name"].tolist() == ["a", "b", "c"]
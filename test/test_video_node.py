@@ -0,0 +1,69 @@
+import cv2
+import numpy as np
+
+# Internal Imports
+from chimerapy.pipelines.generic_nodes.video_nodes import Video
+
+
+def _numbered_video(path, n_frames):
+    """A video whose i-th frame has the brightness 10 * i."""
+    writer = cv2.VideoWriter(
+        str(path), cv2.VideoWriter_fourcc(*"MJPG"), 30, (64, 48)
+    )
+    for i in range(n_frames):
+        writer.write(np.full((48, 64, 3), 10 * i, dtype=np.uint8))
+    writer.release()
+
+
+def test_decimated_frame_count_matches_frame(tmp_path):
+    path = tmp_path / "numbered.avi"
+    _numbered_video(path, 10)
+
+    node = Video(
+        str(path),
+        width=None,
+        height=None,
+        frame_rate=1000,
+        include_meta=True,
+        decimate=3,
+    )
+    node.setup()
+    emitted = []
+    for _ in range(4):
+        chunk = node.step()
+        meta = chunk.get("metadata")["value"]
+        assert meta["belongs_to_video_src"]
+        frame = chunk.get("frame")["value"]
+        emitted.append((meta["frame_count"], int(round(frame.mean() / 10))))
+    node.teardown()
+
+    assert emitted == [(0, 0), (3, 3), (6, 6), (9, 9)]
+
+
+def test_cached_frames_are_not_saved(tmp_path):
+    path = tmp_path / "numbered.avi"
+    _numbered_video(path, 4)
+
+    def run():
+        node = Video(
+            str(path),
+            width=32,
+            height=None,
+            frame_rate=1000,
+            cache_frames=True,
+            cache_dir=str(tmp_path / "cache"),
+            save_name="saved",
+            logdir=tmp_path / "logs",
+        )
+        node.setup()
+        items = [node._read_frame() for _ in range(4)]
+        assert node._read_frame() is None
+        node.teardown()
+        return items
+
+    decoded = run()
+    assert [raw.shape for _, raw in decoded] == [(48, 64, 3)] * 4
+
+    replayed = run()
+    assert [raw for _, raw in replayed] == [None] * 4
+    assert [frame.shape for frame, _ in replayed] == [(24, 32, 3)] * 4
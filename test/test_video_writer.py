@@ -0,0 +1,64 @@
+import logging
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+# Internal Imports
+from chimerapy.pipelines.generic_nodes import video_writer
+from chimerapy.pipelines.generic_nodes.video_writer import AsyncVideoWriter
+
+
+def _frame(value):
+    return np.full((32, 32, 3), value, dtype=np.uint8)
+
+
+def test_frames_are_aligned_to_their_timestamps(tmp_path, monkeypatch):
+    clock = iter([0.0, 0.1, 0.35, 0.42, 0.5])
+    monkeypatch.setattr(video_writer.time, "time", lambda: next(clock))
+
+    writer = AsyncVideoWriter(tmp_path)
+    for value in [0, 50, 100, 150, 200]:
+        assert writer.submit("video", _frame(value), fps=10)
+    writer.close()
+
+    # 0.35 is preceded by two copies of 0.1, and 0.42 is in the slot of 0.35
+    assert writer.stats()["written"] == 6
+    assert writer.stats()["padded"] == 2
+    assert not writer.submit("video", _frame(0), fps=10)
+
+    cap = cv2.VideoCapture(str(tmp_path / "video.mp4"))
+    assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == 6
+    values = []
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        values.append(int(round(frame.mean())))
+    cap.release()
+    assert np.allclose(values, [0, 50, 50, 50, 100, 200], atol=5)
+
+
+def test_batched_frames_are_placed_by_capture_time(tmp_path, monkeypatch):
+    # The frames arrive in one batch, long after they were captured
+    monkeypatch.setattr(video_writer.time, "time", lambda: 100.0)
+
+    writer = AsyncVideoWriter(tmp_path)
+    for i in range(60):
+        assert writer.submit("video", _frame(4 * i), 30, 10 + i / 30)
+    writer.close()
+
+    assert writer.stats()["written"] == 60
+    assert writer.stats()["padded"] == 0
+
+
+def test_no_writer_without_log_directory(tmp_path):
+    node = SimpleNamespace(
+        state=SimpleNamespace(logdir=None),
+        logger=logging.getLogger(__name__),
+        recorder=None,
+    )
+    assert AsyncVideoWriter.for_node(node) is None
+
+    node.state.logdir = tmp_path
+    assert AsyncVideoWriter.for_node(node).directory == tmp_path
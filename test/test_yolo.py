@@ -4,12 +4,17 @@ import os
 import pathlib
 
 import cv2
+import numpy as np
 import pytest
 
 import chimerapy.engine as cpe
 
 # Internal Imports
-from chimerapy.pipelines.yolo_node import YOLONode
+from chimerapy.pipelines.yolo_node import (
+    COCO_ORIGINAL_NAMES,
+    YOLONode,
+    detections_array,
+)
 
 # Test Imports
 
@@ -68,3 +73,15 @@ def test_yolo_main_multiple_inputs(color_cap):
 
     yolo.teardown()
     yolo.shutdown()
+
+
+def test_detections_array():
+    xyxy = np.array(
+        [[1, 2, 3, 4, 0.9, 0], [5, 6, 7, 8, 0.5, 2]], dtype=np.float32
+    )
+    detections = detections_array(xyxy, COCO_ORIGINAL_NAMES, "test")
+
+    assert detections["name"].tolist() == ["person", "car"]
+    assert detections["source"].tolist() == ["test", "test"]
+    assert np.array_equal(detections["xmax"], [3, 7])
+    assert len(detections_array(np.zeros((0, 6)), {0: "person"}, "test")) == 0